@@ -0,0 +1,234 @@
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import platform
+import tempfile
+import threading
+import tracemalloc
+from typing import Callable, Dict, List
+
+from src.logger import Logger, LogLevel
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests"))
+from stub_nexus import StubNexus
+
+
+class BlockingOutput:
+    def __init__(self):
+        self.released = threading.Event()
+
+    def write(self, text: str) -> int:
+        self.released.wait()
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def percentile(sorted_values: List[int], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(len(sorted_values) * fraction))
+    return sorted_values[index] / 1000.0
+
+
+def run_producers(logger: Logger, records: int, threads: int, method: str = "info") -> Dict[str, float]:
+    per_thread = max(1, records // threads)
+    latencies: List[List[int]] = [[] for _ in range(threads)]
+    start_barrier = threading.Barrier(threads + 1)
+
+    def produce(samples: List[int]) -> None:
+        call = getattr(logger, method)
+        clock = time.perf_counter_ns
+        start_barrier.wait()
+        for i in range(per_thread):
+            started = clock()
+            call("order %s filled at %s", i, 101.25)
+            samples.append(clock() - started)
+
+    workers = [threading.Thread(target=produce, args=(samples,)) for samples in latencies]
+    for worker in workers:
+        worker.start()
+    start_barrier.wait()
+    started = time.perf_counter()
+    for worker in workers:
+        worker.join()
+    produced = time.perf_counter() - started
+    logger.flush()
+    drained = time.perf_counter() - started
+
+    samples = sorted(sample for thread_samples in latencies for sample in thread_samples)
+    total = per_thread * threads
+    return {
+        "records": total,
+        "threads": threads,
+        "seconds": round(drained, 6),
+        "records_per_sec": round(total / drained, 1) if drained else 0.0,
+        "call_records_per_sec": round(total / produced, 1) if produced else 0.0,
+        "p50_us": round(percentile(samples, 0.50), 3),
+        "p99_us": round(percentile(samples, 0.99), 3),
+    }
+
+
+def queued_bytes_per_record(enqueue: Callable[[int], None], records: int) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    enqueue(records)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    grown = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return round(grown / records, 1)
+
+
+class Benchmarks:
+    def __init__(self, records: int, threads: int):
+        self.records = records
+        self.threads = threads
+        self.devnull = open(os.devnull, "w")
+        self.temp_dir = tempfile.mkdtemp(prefix="logger-bench-")
+        self.stub = None
+
+    def close(self) -> None:
+        self.devnull.close()
+        if self.stub is not None:
+            self.stub.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def nexus_url(self) -> str:
+        if self.stub is None:
+            self.stub = StubNexus()
+        return self.stub.url
+
+    def logger(self, **options) -> Logger:
+        return Logger(output=self.devnull, **options)
+
+    def measure(self, logger: Logger, method: str = "info") -> List[Dict[str, float]]:
+        results = [run_producers(logger, self.records, 1, method)]
+        if self.threads > 1:
+            results.append(run_producers(logger, self.records, self.threads, method))
+        logger.close()
+        return results
+
+    def disabled_level(self) -> List[Dict[str, float]]:
+        return self.measure(self.logger(min_level=LogLevel.INFO), method="debug")
+
+    def flight_recorder(self) -> List[Dict[str, float]]:
+        logger = self.logger(min_level=LogLevel.INFO)
+        logger.enable_flight_recorder(capacity=10000, trigger_level=None)
+        return self.measure(logger, method="debug")
+
+    def console(self) -> List[Dict[str, float]]:
+        return self.measure(self.logger())
+
+    def console_file(self) -> List[Dict[str, float]]:
+        logger = self.logger()
+        logger.enable_file_logging(log_dir=os.path.join(self.temp_dir, "unbuffered"))
+        results = self.measure(logger)
+        logger.disable_file_logging()
+        return results
+
+    def console_file_buffered(self) -> List[Dict[str, float]]:
+        logger = self.logger()
+        logger.enable_file_logging(log_dir=os.path.join(self.temp_dir, "buffered"), buffered=True, flush_every=256, flush_interval_ms=200)
+        results = self.measure(logger)
+        logger.disable_file_logging()
+        return results
+
+    def console_file_async(self) -> List[Dict[str, float]]:
+        logger = self.logger(async_mode=True)
+        logger.enable_file_logging(log_dir=os.path.join(self.temp_dir, "async"), buffered=True, flush_every=256, flush_interval_ms=200)
+        results = self.measure(logger)
+        logger.disable_file_logging()
+        return results
+
+    def api(self) -> List[Dict[str, float]]:
+        logger = self.logger()
+        logger.enable_api_logging(batch_size=200, max_queue_size=self.records * 2)
+        logger.api_handler.nexus_url = self.nexus_url()
+        results = self.measure(logger)
+        logger.disable_api_logging()
+        return results
+
+    def writer_queue_memory(self) -> float:
+        output = BlockingOutput()
+        logger = Logger(output=output, async_mode=True)
+        logger.info("writer blocked")
+        time.sleep(0.05)
+
+        def enqueue(records: int) -> None:
+            for i in range(records):
+                logger.info("order %s filled at %s", i, 101.25)
+
+        try:
+            return queued_bytes_per_record(enqueue, self.records)
+        finally:
+            output.released.set()
+            logger.close()
+
+    def api_queue_memory(self) -> float:
+        logger = self.logger()
+        logger.enable_api_logging(batch_size=200)
+        handler = logger.api_handler
+        handler.nexus_url = self.nexus_url()
+        released = threading.Event()
+        handler._post = lambda body: released.wait()
+        handler.send_log(LogLevel.INFO, "worker stalled")
+        while handler.log_queue.qsize():
+            time.sleep(0.001)
+
+        def enqueue(records: int) -> None:
+            for i in range(records):
+                handler.send_log(LogLevel.INFO, f"order {i} filled at 101.25", {"symbol": "BTC"})
+
+        try:
+            return queued_bytes_per_record(enqueue, self.records)
+        finally:
+            handler._post = lambda body: None
+            released.set()
+            logger.disable_api_logging()
+
+
+SCENARIOS = ["disabled_level", "flight_recorder", "console", "console_file", "console_file_buffered", "console_file_async", "api"]
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the logger hot path and sinks; prints JSON results.")
+    parser.add_argument("--records", type=int, default=20000, help="records per run (default: 20000)")
+    parser.add_argument("--threads", type=int, default=4, help="producer threads for the contended run (default: 4)")
+    parser.add_argument("--only", action="append", choices=SCENARIOS, help="run only this scenario (repeatable)")
+    parser.add_argument("--no-memory", action="store_true", help="skip the queued-record memory measurements")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args(argv)
+
+    benchmarks = Benchmarks(args.records, args.threads)
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "scenarios": {},
+    }
+    try:
+        for name in args.only or SCENARIOS:
+            report["scenarios"][name] = getattr(benchmarks, name)()
+        if not args.no_memory:
+            report["memory_bytes_per_queued_record"] = {
+                "writer_queue": benchmarks.writer_queue_memory(),
+                "api_queue": benchmarks.api_queue_memory(),
+            }
+    finally:
+        benchmarks.close()
+
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,9 +2,10 @@ from .levels import LogLevel
 from .colors import Colors
 from .formatter import Formatter
 from .file_handler import FileHandler
-from .logger import Logger, log
+from .logger import Logger, BoundLogger, log
 from .dto import LogDTO
-from .api_handler import APIHandler
+from .api_handler import APIHandler, OverflowPolicy
+from .sinks import Sink, StreamSink, FileSink, APISink
 
 __all__ = [
     "LogLevel",
@@ -12,7 +13,22 @@ __all__ = [
     "Formatter",
     "FileHandler",
     "Logger",
+    "BoundLogger",
     "log",
     "LogDTO",
-    "APIHandler"
-] 
\ No newline at end of file
+    "APIHandler",
+    "OverflowPolicy",
+    "AsyncLogger",
+    "AsyncAPIHandler",
+    "Sink",
+    "StreamSink",
+    "FileSink",
+    "APISink"
+] 
+
+
+def __getattr__(name):
+    if name in ("AsyncLogger", "AsyncAPIHandler"):
+        from . import aio
+        return getattr(aio, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
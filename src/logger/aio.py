@@ -0,0 +1,294 @@
+import os
+import sys
+import json
+import asyncio
+import functools
+from queue import Full
+from typing import Any, Dict, List, Optional, TextIO, Tuple
+
+from .dto import LogDTO
+from .levels import LogLevel
+from .logger import Logger
+from .metrics import Metrics
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+
+class AsyncAPIHandler:
+    def __init__(self, service_name: str = "qtb", batch_size: int = 100, batch_max_bytes: int = 1024 * 1024, batch_linger: float = 0.05, max_queue_size: int = 10000, concurrency: int = 4, timeout: float = 2):
+        self.service_name = service_name
+        nexus_port = os.getenv('NEXUS_PORT', '8080')
+        self.nexus_url = f"http://nexus-api:{nexus_port}/logs"
+        self.enabled = True
+        self.batch_size = max(1, batch_size)
+        self.batch_max_bytes = batch_max_bytes
+        self.batch_linger = batch_linger
+        self.max_queue_size = max_queue_size
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self._loop = None
+        self._queue = None
+        self._semaphore = None
+        self._consumer = None
+        self._session = None
+        self._inflight = set()
+        self._dropped = {"newest": 0}
+        self.failed_posts = 0
+        self.sent_posts = 0
+        self.metrics = Metrics()
+
+    def _running_loop(self) -> Optional[asyncio.AbstractEventLoop]:
+        try:
+            return asyncio.get_running_loop()
+        except RuntimeError:
+            return None
+
+    def _ensure_started(self) -> None:
+        if self._consumer is not None:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._consumer = self._loop.create_task(self._consume())
+
+    def send_log(self, level: LogLevel, message: str, data: Optional[Dict[str, str]] = None, timestamp: Optional[float] = None) -> bool:
+        if not self.enabled:
+            return False
+
+        log_dto = LogDTO(
+            level=level.name if isinstance(level, LogLevel) else "INFO",
+            service=self.service_name,
+            message=message,
+            data=data or {},
+            created=timestamp
+        )
+        loop = self._running_loop()
+        if loop is not None and (self._loop is None or loop is self._loop):
+            return self._enqueue(log_dto)
+        if self._loop is None or self._loop.is_closed():
+            return False
+        self._loop.call_soon_threadsafe(self._enqueue, log_dto)
+        return True
+
+    def _enqueue(self, log_dto: LogDTO) -> bool:
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(log_dto)
+            return True
+        except asyncio.QueueFull:
+            self._dropped["newest"] += 1
+            return False
+
+    def dropped_counts(self) -> Dict[str, int]:
+        return dict(self._dropped)
+
+    def stats(self) -> Dict[str, Any]:
+        queue = self._queue
+        return {
+            "queue_depth": queue.qsize() if queue is not None else 0,
+            "queue_capacity": self.max_queue_size,
+            "dropped": self.dropped_counts(),
+            "delivery": {"sent_posts": self.sent_posts, "failed_posts": self.failed_posts},
+            "post_latency": self.metrics.histogram("post_seconds"),
+        }
+
+    def _encode(self, log_dto: LogDTO) -> bytes:
+        return json.dumps(log_dto.to_dict(), separators=(",", ":"), default=str).encode("utf-8")
+
+    async def _next(self, deadline: float) -> Optional[LogDTO]:
+        remaining = deadline - self._loop.time()
+        if remaining <= 0:
+            try:
+                return self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return None
+        try:
+            return await asyncio.wait_for(self._queue.get(), remaining)
+        except asyncio.TimeoutError:
+            return None
+
+    async def _collect_batch(self, head: bytes) -> Tuple[List[bytes], Optional[bytes]]:
+        batch = [head]
+        size = len(head) + 2
+        deadline = self._loop.time() + self.batch_linger
+        while len(batch) < self.batch_size and size < self.batch_max_bytes:
+            log_dto = await self._next(deadline)
+            if log_dto is None:
+                break
+            encoded = self._encode(log_dto)
+            if size + len(encoded) + 1 > self.batch_max_bytes:
+                return batch, encoded
+            batch.append(encoded)
+            size += len(encoded) + 1
+        return batch, None
+
+    async def _consume(self) -> None:
+        head = None
+        while True:
+            if head is None:
+                head = self._encode(await self._queue.get())
+            if self.batch_size > 1:
+                batch, head = await self._collect_batch(head)
+                body = b"[" + b",".join(batch) + b"]"
+            else:
+                batch, head = [head], None
+                body = batch[0]
+            await self._semaphore.acquire()
+            task = self._loop.create_task(self._ship(body, len(batch)))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+
+    async def _ship(self, body: bytes, count: int) -> None:
+        started = self._loop.time()
+        try:
+            await self._post(body)
+        except Exception:
+            self.failed_posts += 1
+        else:
+            self.sent_posts += 1
+        finally:
+            self.metrics.observe("post_seconds", self._loop.time() - started)
+            self._semaphore.release()
+            for _ in range(count):
+                self._queue.task_done()
+
+    async def _post(self, body: bytes) -> None:
+        headers = {"Content-Type": "application/json"}
+        if aiohttp is not None:
+            if self._session is None:
+                self._session = aiohttp.ClientSession(
+                    connector=aiohttp.TCPConnector(limit=self.concurrency),
+                    timeout=aiohttp.ClientTimeout(total=self.timeout),
+                    headers=headers
+                )
+            async with self._session.post(self.nexus_url, data=body) as response:
+                await response.read()
+                status = response.status
+        else:
+            if self._session is None:
+                import requests
+                from requests.adapters import HTTPAdapter
+                self._session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.concurrency)
+                self._session.mount("http://", adapter)
+                self._session.mount("https://", adapter)
+                self._session.headers.update(headers)
+            post = functools.partial(self._session.post, self.nexus_url, data=body, timeout=self.timeout)
+            status = (await self._loop.run_in_executor(None, post)).status_code
+        if status >= 300:
+            raise IOError(f"nexus-api returned {status}")
+
+    async def aflush(self) -> None:
+        if self._queue is not None:
+            await self._queue.join()
+
+    async def aclose(self) -> None:
+        consumer = self._consumer
+        if consumer is None:
+            return
+        await self.aflush()
+        self._consumer = None
+        consumer.cancel()
+        try:
+            await consumer
+        except asyncio.CancelledError:
+            pass
+        session, self._session = self._session, None
+        if session is not None:
+            if aiohttp is not None:
+                await session.close()
+            else:
+                session.close()
+
+    def _run_from_sync(self, coroutine_function) -> None:
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        if self._running_loop() is loop:
+            loop.create_task(coroutine_function())
+        elif loop.is_running():
+            asyncio.run_coroutine_threadsafe(coroutine_function(), loop).result()
+
+    def flush(self) -> None:
+        self._run_from_sync(self.aflush)
+
+    def close(self) -> None:
+        self._run_from_sync(self.aclose)
+
+    def disable(self) -> None:
+        self.enabled = False
+
+    def enable(self) -> None:
+        self.enabled = True
+
+
+class AsyncLogger(Logger):
+    def __init__(self, output: TextIO = sys.stdout, min_level: LogLevel = LogLevel.INFO, log_to_file: bool = False, log_dir: str = "logs", log_to_api: bool = False, service_name: str = "qtb", async_queue_size: int = 0, timestamp_precision: str = "s", file_format: str = "plain"):
+        super().__init__(
+            output=output,
+            min_level=min_level,
+            log_to_file=log_to_file,
+            log_dir=log_dir,
+            service_name=service_name,
+            async_mode=True,
+            async_queue_size=async_queue_size,
+            timestamp_precision=timestamp_precision,
+            file_format=file_format
+        )
+        self.writer_dropped = 0
+        if log_to_api:
+            self.enable_api_logging(service_name=service_name)
+
+    def enable_api_logging(self, service_name: str = "qtb", level: Optional[LogLevel] = None, **handler_options: Any) -> None:
+        if self.api_handler:
+            self.api_handler.close()
+        self.service_name = service_name
+        self.api_handler = AsyncAPIHandler(service_name=service_name, **handler_options)
+        if level is not None:
+            self.set_sink_level("api", level)
+
+    def _emit(self, level: LogLevel, timestamp: float, content: str, data: Optional[Dict[str, str]], template: Optional[Tuple[str, Tuple[Any, ...]]] = None, replay: bool = False) -> None:
+        self._write_local(level, timestamp, content, data, template, replay)
+
+    def _dispatch(self, level: LogLevel, timestamp: float, content: str, data: Optional[Dict[str, str]], template: Optional[Tuple[str, Tuple[Any, ...]]] = None, replay: bool = False) -> None:
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.incr(("records", level))
+        writer_queue = self._writer_queue
+        if writer_queue is not None:
+            try:
+                writer_queue.put_nowait((level, timestamp, content, data, template, replay))
+            except Full:
+                self.writer_dropped += 1
+        else:
+            self._emit(level, timestamp, content, data, template, replay)
+        self._send_remote(level, timestamp, content, data, replay)
+
+    def stats(self) -> Dict[str, Any]:
+        stats = super().stats()
+        stats["writer_dropped"] = self.writer_dropped
+        return stats
+
+    async def aflush(self) -> None:
+        loop = asyncio.get_running_loop()
+        writer_queue = self._writer_queue
+        if writer_queue is not None:
+            await loop.run_in_executor(None, writer_queue.join)
+        if self.file_handler:
+            await loop.run_in_executor(None, self.file_handler.flush)
+        if self.api_handler:
+            await self.api_handler.aflush()
+
+    async def aclose(self) -> None:
+        await self.aflush()
+        api_handler = self.api_handler
+        self.log_to_api = False
+        self.api_handler = None
+        if api_handler:
+            await api_handler.aclose()
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.disable_async_logging)
+        await loop.run_in_executor(None, self.disable_file_logging)
@@ -1,20 +1,76 @@
 import os
-import requests
-from typing import Optional, Dict
-from threading import Thread
-from queue import Queue
+import enum
+import json
+import time
+import atexit
+from typing import TYPE_CHECKING, Any, Optional, Dict, List, Tuple
+from threading import Thread, Lock
+from queue import Queue, Empty, Full
 from .dto import LogDTO
 from .levels import LogLevel
+from .metrics import Metrics
+from .spool import CircuitBreaker, DiskSpool
+
+if TYPE_CHECKING:
+    import requests
+
+
+RETRYABLE_STATUSES = (408, 429)
+
+
+class NexusRejected(Exception):
+    pass
+
+
+class OverflowPolicy(enum.Enum):
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+    BLOCK = "block"
+    DROP_BELOW_LEVEL = "drop_below_level"
 
 
 class APIHandler:
-    def __init__(self, service_name: str = "qtb"):
+    def __init__(self, service_name: str = "qtb", batch_size: int = 1, batch_max_bytes: int = 1024 * 1024, batch_linger: float = 0.05, pool_maxsize: int = 4, timeout: float = 2, max_queue_size: int = 0, overflow_policy: OverflowPolicy = OverflowPolicy.DROP_NEWEST, block_timeout: float = 0.1, overflow_level: LogLevel = LogLevel.ERROR, failure_threshold: int = 5, retry_base_delay: float = 1.0, retry_max_delay: float = 60.0, spool_dir: Optional[str] = None, spool_segment_bytes: int = 8 * 1024 * 1024, spool_max_bytes: int = 256 * 1024 * 1024, spool_replay_batch: int = 500):
         self.service_name = service_name
         nexus_port = os.getenv('NEXUS_PORT', '8080')
         self.nexus_url = f"http://nexus-api:{nexus_port}/logs"
         self.enabled = True
-        self.log_queue = Queue()
-        self._start_worker()
+        self.batch_size = max(1, batch_size)
+        self.batch_max_bytes = batch_max_bytes
+        self.batch_linger = batch_linger
+        self.pool_maxsize = pool_maxsize
+        self.timeout = timeout
+        self.overflow_policy = OverflowPolicy(overflow_policy)
+        self.block_timeout = block_timeout
+        self.overflow_level = overflow_level
+        self.log_queue = Queue(maxsize=max_queue_size)
+        self._dropped = {"newest": 0, "oldest": 0, "timeout": 0, "below_level": 0, "closed": 0}
+        self._dropped_lock = Lock()
+        self._delivery = {"sent": 0, "failed": 0, "spooled": 0, "replayed": 0, "discarded": 0, "rejected": 0}
+        self.metrics = Metrics()
+        self.breaker = CircuitBreaker(failure_threshold, retry_base_delay, retry_max_delay)
+        self.spool = None
+        if spool_dir:
+            self.spool = DiskSpool(spool_dir, segment_bytes=spool_segment_bytes, max_bytes=spool_max_bytes)
+        self.spool_replay_batch = spool_replay_batch
+        self.session = None
+        self._worker_thread = None
+        self._worker_lock = Lock()
+        self.closed = False
+        atexit.register(self.close)
+        if self.spool is not None and self.spool.pending():
+            self._ensure_worker()
+
+    def _create_session(self) -> "requests.Session":
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_maxsize)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"Content-Type": "application/json"})
+        return session
 
     def _level_to_string(self, level: LogLevel) -> str:
         level_map = {
@@ -29,27 +85,237 @@ class APIHandler:
         }
         return level_map.get(level, "INFO")
 
+    def _count_drop(self, reason: str) -> None:
+        with self._dropped_lock:
+            self._dropped[reason] += 1
+
+    def dropped_counts(self) -> Dict[str, int]:
+        with self._dropped_lock:
+            return dict(self._dropped)
+
+    def _replace_below_level(self, log_dto: LogDTO) -> bool:
+        queue = self.log_queue
+        with queue.mutex:
+            for index, queued in enumerate(queue.queue):
+                if queued is not None and LogLevel[queued.level] < self.overflow_level:
+                    del queue.queue[index]
+                    queue.queue.append(log_dto)
+                    return True
+        return False
+
+    def _enqueue(self, level: LogLevel, log_dto: LogDTO) -> bool:
+        try:
+            self.log_queue.put_nowait(log_dto)
+            return True
+        except Full:
+            pass
+
+        policy = self.overflow_policy
+        if policy is OverflowPolicy.DROP_NEWEST:
+            self._count_drop("newest")
+            return False
+
+        if policy is OverflowPolicy.DROP_OLDEST:
+            while True:
+                try:
+                    oldest = self.log_queue.get_nowait()
+                except Empty:
+                    oldest = None
+                else:
+                    self.log_queue.task_done()
+                    if oldest is None:
+                        self.log_queue.put_nowait(None)
+                        self._count_drop("newest")
+                        return False
+                    self._count_drop("oldest")
+                try:
+                    self.log_queue.put_nowait(log_dto)
+                    return True
+                except Full:
+                    continue
+
+        if policy is OverflowPolicy.DROP_BELOW_LEVEL:
+            if level < self.overflow_level:
+                self._count_drop("below_level")
+                return False
+            if self._replace_below_level(log_dto):
+                self._count_drop("below_level")
+                return True
+
+        try:
+            self.log_queue.put(log_dto, timeout=self.block_timeout)
+            return True
+        except Full:
+            self._count_drop("timeout")
+            return False
+
+    def _encode(self, log_dto: LogDTO) -> bytes:
+        return json.dumps(log_dto.to_dict(), separators=(",", ":")).encode("utf-8")
+
+    def _post(self, body: bytes) -> None:
+        if self.session is None:
+            self.session = self._create_session()
+        started = time.perf_counter()
+        try:
+            response = self.session.post(self.nexus_url, data=body, timeout=self.timeout)
+        finally:
+            self.metrics.observe("post_seconds", time.perf_counter() - started)
+        status = response.status_code
+        if status >= 500 or status in RETRYABLE_STATUSES:
+            import requests
+            raise requests.HTTPError(f"nexus-api returned {status}", response=response)
+        if status >= 300:
+            raise NexusRejected(f"nexus-api rejected the batch with {status}")
+
+    def delivery_counts(self) -> Dict[str, int]:
+        counts = dict(self._delivery)
+        if self.spool is not None:
+            counts["spool_dropped"] = self.spool.dropped_records
+        return counts
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self.log_queue.qsize(),
+            "queue_capacity": self.log_queue.maxsize,
+            "dropped": self.dropped_counts(),
+            "delivery": self.delivery_counts(),
+            "circuit": self.breaker.state,
+            "post_latency": self.metrics.histogram("post_seconds"),
+        }
+
+    def _deliver(self, batch: List[bytes], bulk: bool) -> None:
+        if self.breaker.allow():
+            try:
+                self._post(b"[" + b",".join(batch) + b"]" if bulk else batch[0])
+            except NexusRejected:
+                self.breaker.record_success()
+                self._delivery["rejected"] += len(batch)
+                return
+            except Exception:
+                self.breaker.record_failure()
+                self._delivery["failed"] += len(batch)
+            else:
+                self.breaker.record_success()
+                self._delivery["sent"] += len(batch)
+                self._replay_spool()
+                return
+
+        if self.spool is not None:
+            self.spool.append(batch)
+            self._delivery["spooled"] += len(batch)
+        else:
+            self._delivery["discarded"] += len(batch)
+
+    def _replay_spool(self, max_batches: int = 10) -> None:
+        spool = self.spool
+        if spool is None:
+            return
+        for _ in range(max_batches):
+            if not spool.pending() or not self.breaker.allow():
+                return
+            records, position = spool.read_batch(self.spool_replay_batch, self.batch_max_bytes)
+            if records:
+                try:
+                    self._post(b"[" + b",".join(records) + b"]")
+                except NexusRejected:
+                    self._delivery["rejected"] += len(records)
+                except Exception:
+                    self.breaker.record_failure()
+                    return
+                else:
+                    self._delivery["replayed"] += len(records)
+                self.breaker.record_success()
+            spool.commit(position)
+
+    def _idle_timeout(self) -> Optional[float]:
+        if self.spool is None or not self.spool.pending():
+            return None
+        return max(self.breaker.retry_in(), 0.05)
+
+    def _next_record(self) -> Optional[LogDTO]:
+        while True:
+            try:
+                return self.log_queue.get(timeout=self._idle_timeout())
+            except Empty:
+                try:
+                    self._replay_spool()
+                except Exception:
+                    pass
+
     def _worker(self) -> None:
         while True:
+            log_dto = self._next_record()
             try:
-                log_dto = self.log_queue.get()
                 if log_dto is None:
                     break
-                requests.post(
-                    self.nexus_url,
-                    json=log_dto.to_dict(),
-                    timeout=2
-                )
+                self._deliver([self._encode(log_dto)], bulk=False)
             except Exception:
                 pass
             finally:
                 self.log_queue.task_done()
 
-    def _start_worker(self) -> None:
-        worker_thread = Thread(target=self._worker, daemon=True)
-        worker_thread.start()
+    def _collect_batch(self, head: bytes) -> Tuple[List[bytes], Optional[bytes], bool]:
+        batch = [head]
+        size = len(head) + 2
+        deadline = time.monotonic() + self.batch_linger
+        while len(batch) < self.batch_size and size < self.batch_max_bytes:
+            remaining = deadline - time.monotonic()
+            try:
+                if remaining > 0:
+                    log_dto = self.log_queue.get(timeout=remaining)
+                else:
+                    log_dto = self.log_queue.get_nowait()
+            except Empty:
+                break
+            if log_dto is None:
+                return batch, None, True
+            try:
+                encoded = self._encode(log_dto)
+            except Exception:
+                self.log_queue.task_done()
+                continue
+            if size + len(encoded) + 1 > self.batch_max_bytes:
+                return batch, encoded, False
+            batch.append(encoded)
+            size += len(encoded) + 1
+        return batch, None, False
 
-    def send_log(self, level: LogLevel, message: str, data: Optional[Dict[str, str]] = None) -> bool:
+    def _batch_worker(self) -> None:
+        head = None
+        stop = False
+        while not stop:
+            if head is None:
+                log_dto = self._next_record()
+                if log_dto is None:
+                    self.log_queue.task_done()
+                    break
+                try:
+                    head = self._encode(log_dto)
+                except Exception:
+                    self.log_queue.task_done()
+                    continue
+            batch, head, stop = self._collect_batch(head)
+            try:
+                self._deliver(batch, bulk=True)
+            except Exception:
+                pass
+            for _ in batch:
+                self.log_queue.task_done()
+            if stop:
+                self.log_queue.task_done()
+
+    def _start_worker_locked(self) -> None:
+        if self._worker_thread is not None or self.closed:
+            return
+        target = self._batch_worker if self.batch_size > 1 else self._worker
+        self._worker_thread = Thread(target=target, daemon=True)
+        self._worker_thread.start()
+
+    def _ensure_worker(self) -> None:
+        with self._worker_lock:
+            self._start_worker_locked()
+
+    def send_log(self, level: LogLevel, message: str, data: Optional[Dict[str, str]] = None, timestamp: Optional[float] = None) -> bool:
         if not self.enabled:
             return False
 
@@ -58,16 +324,41 @@ class APIHandler:
                 level=self._level_to_string(level),
                 service=self.service_name,
                 message=message,
-                data=data or {}
+                data=data or {},
+                created=timestamp
             )
-            self.log_queue.put_nowait(log_dto)
-            return True
+            with self._worker_lock:
+                if self.closed:
+                    self._count_drop("closed")
+                    return False
+                if self._worker_thread is None:
+                    self._start_worker_locked()
+                return self._enqueue(level, log_dto)
         except Exception:
             return False
 
+    def flush(self) -> None:
+        if self._worker_thread is not None and self._worker_thread.is_alive():
+            self.log_queue.join()
+
+    def close(self, timeout: Optional[float] = None) -> None:
+        with self._worker_lock:
+            if self.closed:
+                return
+            self.closed = True
+            worker_thread, self._worker_thread = self._worker_thread, None
+        atexit.unregister(self.close)
+        if worker_thread is not None:
+            if worker_thread.is_alive():
+                self.log_queue.put(None)
+                worker_thread.join(timeout)
+        if self.session is not None:
+            self.session.close()
+        if self.spool is not None:
+            self.spool.close()
+
     def disable(self) -> None:
         self.enabled = False
 
     def enable(self) -> None:
         self.enabled = True
-
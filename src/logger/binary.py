@@ -0,0 +1,285 @@
+import re
+import sys
+import gzip
+import json
+import mmap
+import struct
+import argparse
+from typing import Any, Dict, Iterator, NamedTuple, Optional, Sequence, Tuple
+
+from .levels import LogLevel
+from .formatter import Formatter, _fast_json_dumps
+
+
+MAGIC = b"\x00QTBLOG1"
+TEMPLATE = 0x01
+RECORD = 0x02
+ARG_NONE, ARG_FALSE, ARG_TRUE, ARG_INT, ARG_FLOAT, ARG_STR = range(6)
+PRIMITIVE_TYPES = (str, int, float, bool, type(None))
+DOUBLE = struct.Struct("<d")
+
+
+class BinaryRecord(NamedTuple):
+    timestamp: float
+    template: str
+    args: Tuple[Any, ...]
+    data: Optional[Dict[str, Any]]
+
+
+class DecodedRecord(NamedTuple):
+    timestamp: float
+    level: LogLevel
+    service: str
+    message: str
+    data: Optional[Dict[str, Any]]
+
+
+PRINTF_PATTERN = re.compile(r"%[-#0 +]*(?:\d+|\*)?(?:\.\d+)?[diouxXeEfFgGcrsa]")
+
+
+def render_message(template: str, args: Tuple[Any, ...]) -> str:
+    if not args:
+        return template
+    try:
+        if "%" in template and PRINTF_PATTERN.search(template):
+            return template % args
+        return template.format(*args)
+    except (TypeError, ValueError, KeyError, IndexError):
+        return f"{template} {args!r}"
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(buffer: Any, position: int) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = buffer[position]
+        position += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, position
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    return value << 1 if value >= 0 else ((-value) << 1) - 1
+
+
+def _unzigzag(value: int) -> int:
+    return value >> 1 if not value & 1 else -((value + 1) >> 1)
+
+
+def _write_bytes(out: bytearray, value: bytes) -> None:
+    _write_varint(out, len(value))
+    out += value
+
+
+class BinaryEncoder:
+    def __init__(self, service: str = "", max_templates: int = 65536):
+        self.service = service
+        self.max_templates = max_templates
+        self._templates: Dict[str, int] = {}
+        self._last_us = 0
+
+    def header(self) -> bytes:
+        self._templates = {}
+        self._last_us = 0
+        out = bytearray(MAGIC)
+        _write_bytes(out, self.service.encode("utf-8"))
+        return bytes(out)
+
+    def _write_arg(self, out: bytearray, arg: Any) -> None:
+        if arg is None:
+            out.append(ARG_NONE)
+        elif arg is True or arg is False:
+            out.append(ARG_TRUE if arg else ARG_FALSE)
+        elif isinstance(arg, int):
+            out.append(ARG_INT)
+            _write_varint(out, _zigzag(arg))
+        elif isinstance(arg, float):
+            out.append(ARG_FLOAT)
+            out += DOUBLE.pack(arg)
+        else:
+            out.append(ARG_STR)
+            _write_bytes(out, arg.encode("utf-8"))
+
+    def encode(self, level: LogLevel, record: BinaryRecord) -> bytes:
+        template, args = record.template, record.args
+        if args and not all(type(arg) in PRIMITIVE_TYPES for arg in args):
+            template, args = render_message(template, args), ()
+
+        out = bytearray()
+        template_id = self._templates.get(template)
+        if template_id is None and args and len(self._templates) < self.max_templates:
+            template_id = self._templates[template] = len(self._templates)
+            out.append(TEMPLATE)
+            _write_varint(out, template_id)
+            _write_bytes(out, template.encode("utf-8"))
+
+        timestamp_us = round(record.timestamp * 1000000)
+        out.append(RECORD)
+        _write_varint(out, _zigzag(timestamp_us - self._last_us))
+        self._last_us = timestamp_us
+        out.append(int(level))
+        if template_id is None:
+            out.append(0)
+            _write_bytes(out, template.encode("utf-8"))
+        else:
+            _write_varint(out, template_id + 1)
+        _write_varint(out, len(args))
+        for arg in args:
+            self._write_arg(out, arg)
+        _write_bytes(out, _fast_json_dumps(record.data).encode("utf-8") if record.data else b"")
+        return bytes(out)
+
+
+class _Reader:
+    def __init__(self, buffer: Any):
+        self.buffer = buffer
+        self.position = 0
+        self.service = ""
+        self.templates: Dict[int, str] = {}
+        self.last_us = 0
+
+    def varint(self) -> int:
+        value, self.position = _read_varint(self.buffer, self.position)
+        return value
+
+    def raw(self) -> bytes:
+        length = self.varint()
+        start = self.position
+        self.position += length
+        if self.position > len(self.buffer):
+            raise IndexError("truncated field")
+        return bytes(self.buffer[start:self.position])
+
+    def text(self) -> str:
+        return self.raw().decode("utf-8")
+
+    def arg(self) -> Any:
+        tag = self.buffer[self.position]
+        self.position += 1
+        if tag == ARG_NONE:
+            return None
+        if tag == ARG_FALSE:
+            return False
+        if tag == ARG_TRUE:
+            return True
+        if tag == ARG_INT:
+            return _unzigzag(self.varint())
+        if tag == ARG_FLOAT:
+            value, = DOUBLE.unpack_from(self.buffer, self.position)
+            self.position += DOUBLE.size
+            return value
+        if tag == ARG_STR:
+            return self.text()
+        raise ValueError(f"unknown argument tag {tag}")
+
+    def header(self) -> None:
+        self.position += len(MAGIC)
+        self.service = self.text()
+        self.templates = {}
+        self.last_us = 0
+
+    def record(self) -> Optional[DecodedRecord]:
+        kind = self.buffer[self.position]
+        if kind == MAGIC[0] and self.buffer[self.position:self.position + len(MAGIC)] == MAGIC:
+            self.header()
+            return None
+        self.position += 1
+        if kind == TEMPLATE:
+            template_id = self.varint()
+            self.templates[template_id] = self.text()
+            return None
+        if kind != RECORD:
+            raise ValueError(f"unknown record type {kind}")
+
+        self.last_us += _unzigzag(self.varint())
+        level = LogLevel(self.buffer[self.position])
+        self.position += 1
+        reference = self.varint()
+        template = self.text() if reference == 0 else self.templates[reference - 1]
+        args = tuple(self.arg() for _ in range(self.varint()))
+        data = self.raw()
+        return DecodedRecord(
+            timestamp=self.last_us / 1000000,
+            level=level,
+            service=self.service,
+            message=render_message(template, args),
+            data=json.loads(data) if data else None
+        )
+
+
+def decode(buffer: Any) -> Iterator[DecodedRecord]:
+    reader = _Reader(buffer)
+    if buffer[:len(MAGIC)] != MAGIC:
+        raise ValueError("not a binary log file")
+    size = len(buffer)
+    while reader.position < size:
+        start = reader.position
+        try:
+            record = reader.record()
+        except (IndexError, KeyError, ValueError, struct.error):
+            position = buffer.find(MAGIC, start + 1)
+            if position < 0:
+                return
+            reader.position = position
+            continue
+        if record is not None:
+            yield record
+
+
+def is_binary_file(path: str) -> bool:
+    opener = gzip.open if path.endswith(".gz") else open
+    try:
+        with opener(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+def read_file(path: str) -> Iterator[DecodedRecord]:
+    if path.endswith(".gz"):
+        with gzip.open(path, "rb") as f:
+            yield from decode(f.read())
+        return
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            yield from decode(buffer)
+
+
+def format_record(record: DecodedRecord, formatter: Formatter, as_json: bool = False) -> str:
+    if as_json:
+        return formatter.format_json(record.level, record.message, record.timestamp, record.service, record.data)
+    return formatter.format_plain(record.level, record.message, record.timestamp)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m logger.binary", description="Decode binary log files to plain text or JSON Lines.")
+    parser.add_argument("paths", nargs="+", help="binary log files (.log or .log.gz)")
+    parser.add_argument("--json", action="store_true", help="print JSON Lines instead of plain text")
+    parser.add_argument("--precision", choices=Formatter.PRECISIONS, default="s", help="timestamp precision (default: s)")
+    args = parser.parse_args(argv)
+
+    formatter = Formatter(precision=args.precision)
+    try:
+        for path in args.paths:
+            try:
+                for record in read_file(path):
+                    print(format_record(record, formatter, as_json=args.json))
+            except (OSError, ValueError) as e:
+                print(f"{path}: {e}", file=sys.stderr)
+                return 1
+    except BrokenPipeError:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,26 +1,100 @@
-from dataclasses import dataclass, asdict
-from typing import Dict, Optional
-from datetime import datetime
-import uuid
+import os
+import time
+import itertools
+from typing import Any, Dict, Optional
+
+
+_ID_MASK = (1 << 62) - 1
+_id_counter = itertools.count()
+_id_seed = 0
+_id_random = 0
+_date_cache = (None, "")
+
+
+def _reseed_ids() -> None:
+    global _id_counter, _id_seed, _id_random
+    random_bits = int.from_bytes(os.urandom(10), "big")
+    _id_seed = random_bits & 0xFFF
+    _id_random = random_bits >> 12
+    _id_counter = itertools.count()
+
+
+_reseed_ids()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reseed_ids)
+
+
+def _new_id(created: float) -> str:
+    millis = int(created * 1000) & 0xFFFFFFFFFFFF
+    rand_b = (_id_random + next(_id_counter)) & _ID_MASK
+    return "%08x-%04x-%04x-%04x-%012x" % (
+        millis >> 16,
+        millis & 0xFFFF,
+        0x7000 | _id_seed,
+        0x8000 | (rand_b >> 48),
+        rand_b & 0xFFFFFFFFFFFF,
+    )
+
+
+def _render_date(created: float) -> str:
+    global _date_cache
+    second = int(created)
+    cached_second, rendered = _date_cache
+    if cached_second != second:
+        rendered = time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(second))
+        _date_cache = (second, rendered)
+    return rendered
 
 
-@dataclass
 class LogDTO:
-    level: str
-    service: str
-    message: str
-    data: Optional[Dict[str, str]] = None
-    id: Optional[str] = None
-    date: Optional[str] = None
-
-    def __post_init__(self):
-        if self.id is None:
-            self.id = str(uuid.uuid4())
-        if self.date is None:
-            self.date = datetime.utcnow().strftime('%Y-%m-%d %H:%M:%S')
-        if self.data is None:
-            self.data = {}
-
-    def to_dict(self) -> dict:
-        return asdict(self)
+    __slots__ = ("level", "service", "message", "data", "created", "_id", "_date")
+
+    def __init__(self, level: str, service: str, message: str, data: Optional[Dict[str, str]] = None, id: Optional[str] = None, date: Optional[str] = None, created: Optional[float] = None):
+        self.level = level
+        self.service = service
+        self.message = message
+        self.data = data if data is not None else {}
+        self.created = created if created is not None else time.time()
+        self._id = id
+        self._date = date
+
+    @property
+    def id(self) -> str:
+        if self._id is None:
+            self._id = _new_id(self.created)
+        return self._id
+
+    @id.setter
+    def id(self, value: Optional[str]) -> None:
+        self._id = value
+
+    @property
+    def date(self) -> str:
+        if self._date is None:
+            self._date = _render_date(self.created)
+        return self._date
+
+    @date.setter
+    def date(self, value: Optional[str]) -> None:
+        self._date = value
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "level": self.level,
+            "service": self.service,
+            "message": self.message,
+            "data": self.data,
+            "id": self.id,
+            "date": self.date,
+        }
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, LogDTO):
+            return NotImplemented
+        return self.to_dict() == other.to_dict()
 
+    def __repr__(self) -> str:
+        return (
+            f"LogDTO(level={self.level!r}, service={self.service!r}, message={self.message!r}, "
+            f"data={self.data!r}, id={self.id!r}, date={self.date!r})"
+        )
@@ -1,36 +1,286 @@
 import os
+import time
 import datetime
-from typing import Optional, TextIO
+from contextlib import contextmanager
+from threading import Thread, Event, RLock
+from typing import Iterator, List, Optional, TextIO
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from .levels import LogLevel
+from .binary import BinaryEncoder, BinaryRecord
+from .rotation import LogArchiver, list_log_files, segment_file_name
 
 
 class FileHandler:
-    def __init__(self, log_dir: str = "logs"):
+    FORMATS = ("plain", "json", "binary")
+
+    def __init__(self, log_dir: str = "logs", buffered: bool = False, buffer_size: int = 64 * 1024, flush_every: Optional[int] = None, flush_interval_ms: int = 0, flush_level: Optional[LogLevel] = None, fsync: bool = False, max_bytes: int = 0, compress: bool = False, compress_level: int = 6, retention_days: Optional[int] = None, max_total_bytes: Optional[int] = None, file_format: str = "plain", multiprocess: bool = False, max_record_bytes: int = 64 * 1024, rotation_grace: float = 60.0, reopen_check_interval: float = 1.0, service_name: str = "qtb"):
+        if file_format not in self.FORMATS:
+            raise ValueError(f"file_format must be one of {self.FORMATS}, got {file_format!r}")
+        if file_format == "binary" and multiprocess:
+            raise ValueError("the binary file format keeps a per-file template table and cannot be shared between processes")
         self.log_dir = log_dir
+        self.file_format = file_format
         self.file_handle = None
+        self.log_file_path = None
         self._log_date = None
-        
+        self._rollover_at = 0.0
+        self.buffered = buffered
+        self.buffer_size = buffer_size
+        if not buffered:
+            self.flush_every = 1
+        else:
+            self.flush_every = max(1, flush_every) if flush_every else 0
+        self.flush_interval = flush_interval_ms / 1000.0
+        self.flush_level = flush_level
+        self.fsync = fsync
+        self._pending = 0
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
+        self._lock = RLock()
+        self._stop_flusher = Event()
+        self._flusher_thread = None
+        self.max_bytes = max_bytes
+        self._file_size = 0
+        self._segment = 0
+        self.multiprocess = multiprocess
+        self.max_record_bytes = max_record_bytes
+        self.rotation_grace = rotation_grace if multiprocess else 0.0
+        self.reopen_check_interval = reopen_check_interval
+        self._chunks = []
+        self._last_reopen_check = time.monotonic()
+        self._encoder = BinaryEncoder(service=service_name) if file_format == "binary" else None
+        self.archiver = None
+        if compress or retention_days is not None or max_total_bytes is not None:
+            self.archiver = LogArchiver(
+                log_dir,
+                compress=compress,
+                compress_level=compress_level,
+                retention_days=retention_days,
+                max_total_bytes=max_total_bytes
+            )
+
     def setup(self) -> None:
         if not os.path.exists(self.log_dir):
             os.makedirs(self.log_dir)
-            
+        if self.archiver:
+            self.archiver.submit()
+        if self.buffered and self.flush_interval > 0 and self._flusher_thread is None:
+            self._flusher_thread = Thread(target=self._flusher, daemon=True)
+            self._flusher_thread.start()
+
+    def _next_rollover(self, now: float) -> float:
+        tomorrow = datetime.date.fromtimestamp(now) + datetime.timedelta(days=1)
+        return time.mktime(tomorrow.timetuple())
+
     def ensure_log_file_for_today(self) -> None:
-        today = datetime.datetime.now().strftime("%Y-%m-%d")
-        
-        if self._log_date != today:
-            if self.file_handle:
-                self.file_handle.close()
-                
-            self._log_date = today
-            log_file_path = os.path.join(self.log_dir, f"{self._log_date}.log")
-            self.file_handle = open(log_file_path, "a", encoding="utf-8")
-    
-    def write(self, message: str) -> None:
-        self.ensure_log_file_for_today()
+        now = time.time()
+        if now < self._rollover_at:
+            return
+
+        with self._lock:
+            today = datetime.date.fromtimestamp(now).strftime("%Y-%m-%d")
+            self._rollover_at = self._next_rollover(now)
+            if self._log_date != today:
+                closed_path = self._close_log_file()
+                self._log_date = today
+                self._open_log_file()
+                if closed_path and self.archiver:
+                    self.archiver.submit(closed_path, delay=self.rotation_grace)
+
+    def _last_segment(self) -> int:
+        return max(
+            [log_file.segment for log_file in list_log_files(self.log_dir)
+             if log_file.date == self._log_date and log_file.segment is not None],
+            default=0
+        )
+
+    def _open_log_file(self) -> None:
+        self.log_file_path = os.path.join(self.log_dir, f"{self._log_date}.log")
+        if self.multiprocess:
+            self.file_handle = open(self.log_file_path, "ab", buffering=0)
+            self._file_size = os.fstat(self.file_handle.fileno()).st_size
+            self._last_reopen_check = time.monotonic()
+        elif self._encoder is not None:
+            self.file_handle = open(self.log_file_path, "ab", buffering=self.buffer_size if self.buffered else -1)
+            self.file_handle.write(self._encoder.header())
+            self._file_size = self.file_handle.tell()
+        else:
+            buffering = self.buffer_size if self.buffered else -1
+            self.file_handle = open(self.log_file_path, "a", encoding="utf-8", buffering=buffering)
+            self._file_size = self.file_handle.tell()
+        self._segment = self._last_segment()
+        if self.archiver:
+            self.archiver.active_path = self.log_file_path
+
+    def _close_log_file(self) -> Optional[str]:
+        if not self.file_handle:
+            return None
+        self._flush_locked()
+        self.file_handle.close()
+        self.file_handle = None
+        return self.log_file_path
+
+    def _rotate_segment_locked(self) -> None:
+        closed_path = self._close_log_file()
+        self._segment += 1
+        segment_path = os.path.join(self.log_dir, segment_file_name(self._log_date, self._segment))
+        os.rename(closed_path, segment_path)
+        self._open_log_file()
+        if self.archiver:
+            self.archiver.submit(segment_path)
+
+    @contextmanager
+    def _rotation_lock(self) -> Iterator[None]:
+        if fcntl is None:
+            yield
+            return
+        lock_fd = os.open(os.path.join(self.log_dir, ".rotate.lock"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(lock_fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            fcntl.flock(lock_fd, fcntl.LOCK_UN)
+            os.close(lock_fd)
+
+    def _path_stat(self) -> Optional[os.stat_result]:
+        try:
+            return os.stat(self.log_file_path)
+        except FileNotFoundError:
+            return None
+
+    def _reopen_locked(self) -> None:
+        self.file_handle.close()
+        self.file_handle = None
+        self._open_log_file()
+
+    def _check_reopen_locked(self) -> None:
+        self._last_reopen_check = time.monotonic()
+        path_stat = self._path_stat()
+        if path_stat is None or path_stat.st_ino != os.fstat(self.file_handle.fileno()).st_ino:
+            self._reopen_locked()
+        else:
+            self._file_size = path_stat.st_size
+
+    def _rotate_shared_locked(self) -> None:
+        self._flush_locked()
+        rotated_path = None
+        with self._rotation_lock():
+            path_stat = self._path_stat()
+            current_inode = os.fstat(self.file_handle.fileno()).st_ino
+            if path_stat is not None and path_stat.st_ino == current_inode:
+                if path_stat.st_size < self.max_bytes:
+                    self._file_size = path_stat.st_size
+                    return
+                rotated_path = os.path.join(self.log_dir, segment_file_name(self._log_date, self._last_segment() + 1))
+                os.rename(self.log_file_path, rotated_path)
+            self._reopen_locked()
+        if rotated_path and self.archiver:
+            self.archiver.submit(rotated_path, delay=self.rotation_grace)
+
+    def _encode_record(self, message: str) -> bytes:
+        record = (message + "\n").encode("utf-8")
+        if len(record) > self.max_record_bytes:
+            marker = b"...[truncated]\n"
+            record = record[:self.max_record_bytes - len(marker)].decode("utf-8", "ignore").encode("utf-8") + marker
+        return record
+
+    def _write_chunks_locked(self) -> None:
+        chunks = self._chunks
+        if not chunks:
+            return
+        self._chunks = []
+        if time.monotonic() - self._last_reopen_check >= self.reopen_check_interval:
+            self._check_reopen_locked()
+
+        limit = max(self.buffer_size, self.max_record_bytes)
+        batch: List[bytes] = []
+        batch_size = 0
+        for chunk in chunks:
+            if batch and batch_size + len(chunk) > limit:
+                self._write_all(b"".join(batch))
+                batch, batch_size = [], 0
+            batch.append(chunk)
+            batch_size += len(chunk)
+        self._write_all(b"".join(batch))
+
+    def _write_all(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            written = self.file_handle.write(view)
+            view = view[written:]
+
+    def _flush_locked(self) -> None:
+        self._pending = 0
+        self._pending_bytes = 0
+        self._last_flush = time.monotonic()
         if self.file_handle:
-            print(message, file=self.file_handle)
-            self.file_handle.flush()
-    
+            if self.multiprocess:
+                self._write_chunks_locked()
+            else:
+                self.file_handle.flush()
+            if self.fsync:
+                os.fsync(self.file_handle.fileno())
+
+    def _flusher(self) -> None:
+        while not self._stop_flusher.wait(self.flush_interval):
+            with self._lock:
+                if self._pending:
+                    self._flush_locked()
+
+    def write(self, message: str, level: Optional[LogLevel] = None) -> None:
+        self.ensure_log_file_for_today()
+        with self._lock:
+            if not self.file_handle:
+                return
+            if self.multiprocess:
+                chunk = self._encode_record(message)
+                self._chunks.append(chunk)
+                size = len(chunk)
+            else:
+                line = message + "\n"
+                self.file_handle.write(line)
+                size = len(line) if line.isascii() else len(line.encode("utf-8"))
+            self._record_written_locked(size, level)
+
+    def write_record(self, level: LogLevel, record: BinaryRecord) -> None:
+        self.ensure_log_file_for_today()
+        with self._lock:
+            if not self.file_handle:
+                return
+            encoded = self._encoder.encode(level, record)
+            self.file_handle.write(encoded)
+            self._record_written_locked(len(encoded), level)
+
+    def _record_written_locked(self, size: int, level: Optional[LogLevel]) -> None:
+        self._pending += 1
+        self._pending_bytes += size
+        self._file_size += size
+        if self.max_bytes and self._file_size >= self.max_bytes:
+            if self.multiprocess:
+                self._rotate_shared_locked()
+            else:
+                self._rotate_segment_locked()
+            return
+        if (
+            (self.flush_every and self._pending >= self.flush_every)
+            or (self.multiprocess and self._pending_bytes >= self.buffer_size)
+            or (self.flush_level is not None and level is not None and level >= self.flush_level)
+            or (self.flush_interval > 0 and time.monotonic() - self._last_flush >= self.flush_interval)
+        ):
+            self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
     def close(self) -> None:
-        if self.file_handle:
-            self.file_handle.close()
-            self.file_handle = None 
\ No newline at end of file
+        self._stop_flusher.set()
+        with self._lock:
+            self._close_log_file()
+        if self.archiver:
+            self.archiver.close()
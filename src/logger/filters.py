@@ -0,0 +1,95 @@
+import time
+import random
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .levels import LogLevel
+
+
+class DuplicateSuppressor:
+    def __init__(self, summary_interval: float = 5.0):
+        self.summary_interval = summary_interval
+        self.suppressed = 0
+        self._lock = Lock()
+        self._last = None
+        self._last_level = None
+        self._repeats = 0
+        self._streak_started = 0.0
+
+    def check(self, level: LogLevel, content: Any, args: Tuple[Any, ...], now: float) -> Tuple[bool, Optional[Tuple[LogLevel, int]]]:
+        key = (level, content, args)
+        with self._lock:
+            if key == self._last:
+                self._repeats += 1
+                self.suppressed += 1
+                if now - self._streak_started >= self.summary_interval:
+                    summary = (level, self._repeats)
+                    self._repeats = 0
+                    self._streak_started = now
+                    return False, summary
+                return False, None
+
+            summary = (self._last_level, self._repeats) if self._repeats else None
+            self._last = key
+            self._last_level = level
+            self._repeats = 0
+            self._streak_started = now
+            return True, summary
+
+    def drain(self) -> Optional[Tuple[LogLevel, int]]:
+        with self._lock:
+            if not self._repeats:
+                return None
+            summary = (self._last_level, self._repeats)
+            self._repeats = 0
+            return summary
+
+
+class RateLimiter:
+    def __init__(self, rate: float, burst: float, by_call_site: bool = False, max_keys: int = 10000):
+        self.rate = rate
+        self.burst = burst
+        self.by_call_site = by_call_site
+        self.max_keys = max_keys
+        self.suppressed = 0
+        self._lock = Lock()
+        self._buckets: "OrderedDict[Hashable, list]" = OrderedDict()
+
+    def acquire(self, key: Hashable, now: Optional[float] = None) -> Tuple[bool, int]:
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                if len(self._buckets) >= self.max_keys:
+                    self._buckets.popitem(last=False)
+                bucket = self._buckets[key] = [self.burst, now, 0]
+            else:
+                self._buckets.move_to_end(key)
+                bucket[0] = min(self.burst, bucket[0] + (now - bucket[1]) * self.rate)
+                bucket[1] = now
+
+            if bucket[0] < 1.0:
+                bucket[2] += 1
+                self.suppressed += 1
+                return False, 0
+            bucket[0] -= 1.0
+            dropped, bucket[2] = bucket[2], 0
+            return True, dropped
+
+
+class LevelSampler:
+    def __init__(self, rates: Dict[LogLevel, float]):
+        self.rates = dict(rates)
+        self.sampled_out = 0
+        self._random = random.random
+        self._lock = Lock()
+
+    def keep(self, level: LogLevel) -> bool:
+        rate = self.rates.get(level)
+        if rate is None or rate >= 1.0 or self._random() < rate:
+            return True
+        with self._lock:
+            self.sampled_out += 1
+        return False
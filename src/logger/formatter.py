@@ -1,10 +1,61 @@
-import datetime
+import json
+import time
+from typing import Any, Dict, Optional, Tuple
 from .levels import LogLevel
 from .colors import Colors
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_dumps(value: Any) -> str:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+if orjson is not None:
+    def _fast_json_dumps(value: Any) -> str:
+        try:
+            return orjson.dumps(value, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+        except TypeError:
+            return _json_dumps(value)
+else:
+    _fast_json_dumps = _json_dumps
+
+
+class BoundContext(dict):
+    __slots__ = ("text", "json")
+
+    def __init__(self, context: Dict[str, Any]):
+        super().__init__(context)
+        self.text = "".join(f" {key}={value}" for key, value in self.items())
+        self.json = _fast_json_dumps(dict(self)) if self else "{}"
+
+    def merged(self, data: Dict[str, Any]) -> "BoundContext":
+        merged = BoundContext.__new__(BoundContext)
+        dict.__init__(merged, self)
+        dict.update(merged, data)
+        merged.text = self.text
+        merged.json = None
+        return merged
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> None:
+        raise TypeError("bound context is read-only; use bind() to add keys")
+
+    __setitem__ = __delitem__ = update = pop = popitem = clear = setdefault = _readonly
+    __ior__ = _readonly
+
 
 class Formatter:
-    def __init__(self):
+    PRECISIONS = ("s", "ms", "us")
+
+    def __init__(self, precision: str = "s"):
+        if precision not in self.PRECISIONS:
+            raise ValueError(f"precision must be one of {self.PRECISIONS}, got {precision!r}")
+        self.precision = precision
+        self._cached_timestamp = (None, "")
+
         self._level_colors = {
             LogLevel.FATAL: f"{Colors.BOLD}{Colors.BRIGHT_RED}",
             LogLevel.CRITICAL: Colors.BRIGHT_RED,
@@ -26,24 +77,71 @@ class Formatter:
             LogLevel.DEBUG: "DEBUG",
             LogLevel.TRACE: "TRACE",
         }
-    
-    def format_colored(self, level: LogLevel, content: str) -> str:
-        now = datetime.datetime.now()
-        timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
-        
+
+        self._prefixes = {}
+        self._json_prefixes = {}
+        for level in self._level_names:
+            self._build_prefixes(level)
+
+    def _build_prefixes(self, level: LogLevel) -> Tuple[str, str, str]:
         level_color = self._level_colors.get(level, "")
-        level_name = self._level_names.get(level, "UNKNOWN")
-        
-        return (
-            f"{level_color}{timestamp}{Colors.RESET} "
-            f"[{level_color}{level_name.ljust(8)}{Colors.RESET}] "
-            f"{content}"
+        level_name = self._level_names.get(level, "UNKNOWN").ljust(8)
+        prefixes = (
+            level_color,
+            f"{Colors.RESET} [{level_color}{level_name}{Colors.RESET}] ",
+            f" [{level_name}] ",
         )
+        if level in self._level_names:
+            self._prefixes[level] = prefixes
+        return prefixes
+
+    def format_timestamp(self, timestamp: Optional[float] = None) -> str:
+        if timestamp is None:
+            timestamp = time.time()
+        second = int(timestamp)
+        cached_second, rendered = self._cached_timestamp
+        if cached_second != second:
+            rendered = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+            self._cached_timestamp = (second, rendered)
+
+        if self.precision == "ms":
+            return "%s.%03d" % (rendered, int((timestamp - second) * 1000))
+        if self.precision == "us":
+            return "%s.%06d" % (rendered, int((timestamp - second) * 1000000))
+        return rendered
+
+    def format_colored(self, level: LogLevel, content: str, timestamp: Optional[float] = None) -> str:
+        prefixes = self._prefixes.get(level) or self._build_prefixes(level)
+        return f"{prefixes[0]}{self.format_timestamp(timestamp)}{prefixes[1]}{content}"
     
-    def format_plain(self, level: LogLevel, content: str) -> str:
-        now = datetime.datetime.now()
-        timestamp = now.strftime("%Y-%m-%d %H:%M:%S")
-        
-        level_name = self._level_names.get(level, "UNKNOWN")
-        
-        return f"{timestamp} [{level_name.ljust(8)}] {content}" 
\ No newline at end of file
+    def format_plain(self, level: LogLevel, content: str, timestamp: Optional[float] = None) -> str:
+        prefixes = self._prefixes.get(level) or self._build_prefixes(level)
+        return f"{self.format_timestamp(timestamp)}{prefixes[2]}{content}"
+
+    def format_both(self, level: LogLevel, content: str, timestamp: Optional[float] = None) -> Tuple[str, str]:
+        prefixes = self._prefixes.get(level) or self._build_prefixes(level)
+        rendered = self.format_timestamp(timestamp)
+        return (
+            f"{prefixes[0]}{rendered}{prefixes[1]}{content}",
+            f"{rendered}{prefixes[2]}{content}",
+        )
+
+    def format_json(self, level: LogLevel, content: str, timestamp: Optional[float] = None, service: str = "", data: Optional[Dict[str, Any]] = None) -> str:
+        prefix = self._json_prefixes.get((level, service))
+        if prefix is None:
+            prefix = (
+                f'{{"level":{_json_dumps(self._level_names.get(level, "UNKNOWN"))},'
+                f'"service":{_json_dumps(service)},"timestamp":"'
+            )
+            if level in self._level_names:
+                self._json_prefixes[(level, service)] = prefix
+        if not data:
+            data_json = "{}"
+        elif type(data) is BoundContext and data.json is not None:
+            data_json = data.json
+        else:
+            data_json = _fast_json_dumps(data)
+        return (
+            f'{prefix}{self.format_timestamp(timestamp)}","message":{_fast_json_dumps(content)},'
+            f'"data":{data_json}}}'
+        )
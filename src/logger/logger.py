@@ -1,87 +1,550 @@
+import re
 import sys
-from typing import TextIO, Optional, Dict
+import time
+import atexit
+from queue import Queue
+from threading import Thread
+from typing import TextIO, Optional, Dict, Any, Callable, Tuple, Union
 
 from .levels import LogLevel
-from .formatter import Formatter
+from .formatter import BoundContext, Formatter
 from .file_handler import FileHandler
 from .api_handler import APIHandler
+from .filters import DuplicateSuppressor, RateLimiter, LevelSampler
+from .recorder import FlightRecorder
+from .metrics import Metrics, TextfileExporter, render_prometheus
+from .sinks import Sink, StreamSink, FileSink, APISink
+from .binary import BinaryRecord, render_message
+from .tracebacks import ExceptionTracker, TracebackRenderer, traceback_summary
+
+Message = Union[str, Callable[[], str]]
+PLACEHOLDER_PATTERN = re.compile(r"%[-#0 +]*(?:\d+|\*)?(?:\.\d+)?[diouxXeEfFgGcrsa]|\{[^{}]*\}")
+
+
+def _split_data(content: Message, data: Optional[Dict[str, str]], args: Tuple[Any, ...]) -> Tuple[Optional[Dict[str, str]], Tuple[Any, ...]]:
+    if data is None and len(args) == 1 and isinstance(args[0], dict):
+        if not isinstance(content, str) or not PLACEHOLDER_PATTERN.search(content):
+            return args[0], ()
+    return data, args
 
 
 class Logger:
-    def __init__(self, output: TextIO = sys.stdout, min_level: LogLevel = LogLevel.INFO, log_to_file: bool = False, log_dir: str = "logs", log_to_api: bool = False, service_name: str = "qtb"):
+    def __init__(self, output: TextIO = sys.stdout, min_level: LogLevel = LogLevel.INFO, log_to_file: bool = False, log_dir: str = "logs", log_to_api: bool = False, service_name: str = "qtb", async_mode: bool = False, async_queue_size: int = 0, timestamp_precision: str = "s", file_format: str = "plain"):
+        self.sinks: Dict[str, Sink] = {}
+        self._local_pipeline: Tuple[Tuple[Tuple[str, Sink], ...], Dict[LogLevel, frozenset]] = ((), {})
+        self._remote_sinks: Tuple[Tuple[str, Sink], ...] = ()
+        self._keep_templates = False
+        self._api_options: Tuple[Optional[APIHandler], Dict[str, Any]] = (None, {})
+        self._min_level = min_level
+        self._threshold = min_level
+        self.service_name = service_name
+        self.formatter = Formatter(precision=timestamp_precision)
+        self.async_mode = False
+        self._writer_queue = None
+        self._writer_thread = None
+        self.suppressor = None
+        self.rate_limiter = None
+        self.sampler = None
+        self.recorder = None
+        self.tracebacks = TracebackRenderer()
+        self.exception_tracker = ExceptionTracker()
+        self.metrics = Metrics()
+        self._exporter = None
+
         self.output = output
-        self.min_level = min_level
-        self.log_to_file = log_to_file
-        self.log_to_api = log_to_api
-        self.formatter = Formatter()
-        self.file_handler = None
-        self.api_handler = None
         
-        if self.log_to_file:
-            self.file_handler = FileHandler(log_dir=log_dir)
+        if log_to_file:
+            self.file_handler = FileHandler(log_dir=log_dir, file_format=file_format, service_name=service_name)
             self.file_handler.setup()
         
-        if self.log_to_api:
-            self.api_handler = APIHandler(service_name=service_name)
-    
-    def enable_file_logging(self, log_dir: str = "logs") -> None:
-        self.log_to_file = True
-        self.file_handler = FileHandler(log_dir=log_dir)
-        self.file_handler.setup()
-        
-    def disable_file_logging(self) -> None:
-        self.log_to_file = False
+        if log_to_api:
+            self.enable_api_logging(service_name=service_name)
+
+        if async_mode:
+            self.enable_async_logging(queue_size=async_queue_size)
+
+    @property
+    def min_level(self) -> LogLevel:
+        return self._min_level
+
+    @min_level.setter
+    def min_level(self, level: LogLevel) -> None:
+        self._min_level = level
+        self._update_sinks()
+
+    def _update_sinks(self) -> None:
+        enabled = [(name, sink) for name, sink in self.sinks.items() if sink.enabled]
+        local_sinks = tuple((name, sink) for name, sink in enabled if sink.local)
+        formats_by_level = {
+            level: frozenset(sink.format for _, sink in local_sinks if level >= sink.level)
+            for level in LogLevel
+        }
+        self._local_pipeline = (local_sinks, formats_by_level)
+        self._keep_templates = any(sink.format == "binary" for _, sink in local_sinks)
+        self._remote_sinks = tuple((name, sink) for name, sink in enabled if not sink.local)
+        lowest = min((sink.level for _, sink in enabled), default=LogLevel.FATAL + 1)
+        self._threshold = max(self._min_level, lowest)
+
+    def add_sink(self, name: str, sink: Sink) -> None:
+        previous = self.sinks.get(name)
+        self.sinks[name] = sink
+        self._update_sinks()
+        if previous is not None and previous is not sink:
+            previous.close()
+
+    def remove_sink(self, name: str) -> Optional[Sink]:
+        sink = self.sinks.pop(name, None)
+        self._update_sinks()
+        return sink
+
+    def set_sink_level(self, name: str, level: LogLevel) -> None:
+        self.sinks[name].level = level
+        self._update_sinks()
+
+    def _sink_attribute(self, name: str, attribute: str) -> Any:
+        sink = self.sinks.get(name)
+        return getattr(sink, attribute) if sink is not None else None
+
+    def _replace_builtin_sink(self, name: str, sink: Optional[Sink]) -> None:
+        previous = self.sinks.get(name)
+        if sink is None:
+            self.sinks.pop(name, None)
+        else:
+            if previous is not None:
+                sink.level = previous.level
+            self.sinks[name] = sink
+        self._update_sinks()
+
+    @property
+    def output(self) -> Optional[TextIO]:
+        return self._sink_attribute("console", "stream")
+
+    @output.setter
+    def output(self, stream: Optional[TextIO]) -> None:
+        self._replace_builtin_sink("console", StreamSink(stream) if stream is not None else None)
+
+    @property
+    def file_handler(self) -> Optional[FileHandler]:
+        return self._sink_attribute("file", "handler")
+
+    @file_handler.setter
+    def file_handler(self, handler: Optional[FileHandler]) -> None:
+        self._replace_builtin_sink("file", FileSink(handler) if handler is not None else None)
+
+    @property
+    def api_handler(self) -> Optional[APIHandler]:
+        return self._sink_attribute("api", "handler")
+
+    @api_handler.setter
+    def api_handler(self, handler: Optional[APIHandler]) -> None:
+        self._replace_builtin_sink("api", APISink(handler) if handler is not None else None)
+
+    def _sink_enabled(self, name: str) -> bool:
+        sink = self.sinks.get(name)
+        return sink is not None and sink.enabled
+
+    def _set_sink_enabled(self, name: str, enabled: bool) -> None:
+        sink = self.sinks.get(name)
+        if sink is not None:
+            sink.enabled = enabled
+            self._update_sinks()
+
+    @property
+    def log_to_file(self) -> bool:
+        return self._sink_enabled("file")
+
+    @log_to_file.setter
+    def log_to_file(self, enabled: bool) -> None:
+        self._set_sink_enabled("file", enabled)
+
+    @property
+    def log_to_api(self) -> bool:
+        return self._sink_enabled("api")
+
+    @log_to_api.setter
+    def log_to_api(self, enabled: bool) -> None:
+        self._set_sink_enabled("api", enabled)
+
+    def enable_file_logging(self, log_dir: str = "logs", level: Optional[LogLevel] = None, **handler_options: Any) -> None:
         if self.file_handler:
             self.file_handler.close()
-            self.file_handler = None
+        handler_options.setdefault("service_name", self.service_name)
+        handler = FileHandler(log_dir=log_dir, **handler_options)
+        handler.setup()
+        self.file_handler = handler
+        if level is not None:
+            self.set_sink_level("file", level)
+        
+    def disable_file_logging(self) -> None:
+        handler = self.file_handler
+        self.file_handler = None
+        if handler:
+            handler.close()
     
-    def enable_api_logging(self, service_name: str = "qtb") -> None:
-        self.log_to_api = True
-        self.api_handler = APIHandler(service_name=service_name)
+    def enable_api_logging(self, service_name: str = "qtb", level: Optional[LogLevel] = None, **handler_options: Any) -> None:
+        handler = self.api_handler
+        reusable, options = self._api_options
+        if handler is not None and handler is reusable and not handler.closed and options == handler_options:
+            handler.service_name = service_name
+            handler.enable()
+            self.log_to_api = True
+        else:
+            if handler:
+                handler.close()
+            handler = APIHandler(service_name=service_name, **handler_options)
+            self.api_handler = handler
+            self._api_options = (handler, dict(handler_options))
+            if self.async_mode:
+                atexit.unregister(self.disable_async_logging)
+                atexit.register(self.disable_async_logging)
+        self.service_name = service_name
+        if level is not None:
+            self.set_sink_level("api", level)
         
     def disable_api_logging(self) -> None:
-        self.log_to_api = False
+        handler = self.api_handler
         self.api_handler = None
+        if handler:
+            handler.close()
 
-    def _log(self, level: LogLevel, content: str, data: Optional[Dict[str, str]] = None) -> None:
-        if level < self.min_level:
+    def api_dropped(self) -> Dict[str, int]:
+        if not self.api_handler:
+            return {}
+        return self.api_handler.dropped_counts()
+
+    def enable_async_logging(self, queue_size: int = 0) -> None:
+        if self.async_mode:
             return
+        self._writer_queue = Queue(maxsize=queue_size)
+        self._writer_thread = Thread(target=self._writer, daemon=True)
+        self._writer_thread.start()
+        self.async_mode = True
+        atexit.register(self.disable_async_logging)
 
-        formatted_message = self.formatter.format_colored(level, content)
-        print(formatted_message, file=self.output)
-        self.output.flush()
-        
-        if self.log_to_file and self.file_handler:
-            plain_message = self.formatter.format_plain(level, content)
-            self.file_handler.write(plain_message)
-        
-        if self.log_to_api and self.api_handler:
-            self.api_handler.send_log(level, content, data)
+    def disable_async_logging(self) -> None:
+        if not self.async_mode:
+            return
+        self.async_mode = False
+        atexit.unregister(self.disable_async_logging)
+        writer_queue = self._writer_queue
+        self._writer_queue = None
+        writer_queue.put(None)
+        self._writer_thread.join()
+        self._writer_thread = None
+
+    def _writer(self) -> None:
+        writer_queue = self._writer_queue
+        while True:
+            record = writer_queue.get()
+            try:
+                if record is None:
+                    break
+                self._emit(*record)
+            except Exception:
+                pass
+            finally:
+                writer_queue.task_done()
+
+    def _emit(self, level: LogLevel, timestamp: float, content: str, data: Optional[Dict[str, str]], template: Optional[Tuple[str, Tuple[Any, ...]]] = None, replay: bool = False) -> None:
+        self._write_local(level, timestamp, content, data, template, replay)
+        self._send_remote(level, timestamp, content, data, replay)
+
+    def _send_remote(self, level: LogLevel, timestamp: float, content: str, data: Optional[Dict[str, str]], replay: bool = False) -> None:
+        for _, sink in self._remote_sinks:
+            if replay or level >= sink.level:
+                sink.send(level, timestamp, content, data)
+
+    def _render(self, formats: frozenset, level: LogLevel, timestamp: float, content: str, data: Optional[Dict[str, str]], template: Optional[Tuple[str, Tuple[Any, ...]]] = None) -> Dict[str, Any]:
+        rendered = {}
+        text = content + data.text if type(data) is BoundContext else content
+        if "colored" in formats and "plain" in formats:
+            rendered["colored"], rendered["plain"] = self.formatter.format_both(level, text, timestamp)
+        elif "colored" in formats:
+            rendered["colored"] = self.formatter.format_colored(level, text, timestamp)
+        elif "plain" in formats:
+            rendered["plain"] = self.formatter.format_plain(level, text, timestamp)
+        if "json" in formats:
+            rendered["json"] = self.formatter.format_json(level, content, timestamp, self.service_name, data)
+        if "binary" in formats:
+            template, args = template or (content, ())
+            rendered["binary"] = BinaryRecord(timestamp, template, args, data)
+        return rendered
+
+    def _write_local(self, level: LogLevel, timestamp: float, content: str, data: Optional[Dict[str, str]], template: Optional[Tuple[str, Tuple[Any, ...]]] = None, replay: bool = False) -> None:
+        sinks, formats_by_level = self._local_pipeline
+        formats = None if replay else formats_by_level.get(level)
+        if formats is None:
+            formats = frozenset(sink.format for _, sink in sinks if replay or level >= sink.level)
+        if not formats:
+            return
+        rendered = self._render(formats, level, timestamp, content, data, template)
+
+        metrics = self.metrics
+        for name, sink in sinks:
+            if level < sink.level and not replay:
+                continue
+            if metrics is None:
+                sink.emit(level, rendered[sink.format])
+                continue
+            started = time.perf_counter()
+            sink.emit(level, rendered[sink.format])
+            metrics.observe(("write_seconds", name), time.perf_counter() - started)
+            metrics.incr(("writes", name))
+
+    def is_enabled(self, level: LogLevel) -> bool:
+        return level >= self._threshold
+
+    def _render_message(self, content: Message, args: Tuple[Any, ...]) -> str:
+        if callable(content):
+            content = content()
+        if not args:
+            return content if isinstance(content, str) else str(content)
+
+        return render_message(content, tuple(arg() if callable(arg) else arg for arg in args))
+
+    def enable_duplicate_suppression(self, summary_interval: float = 5.0) -> None:
+        self.suppressor = DuplicateSuppressor(summary_interval=summary_interval)
 
-    def fatal(self, content: str, data: Optional[Dict[str, str]] = None) -> None:
-        self._log(LogLevel.FATAL, content, data)
+    def enable_rate_limit(self, rate: float, burst: float = 10.0, by_call_site: bool = False) -> None:
+        self.rate_limiter = RateLimiter(rate=rate, burst=burst, by_call_site=by_call_site)
 
-    def critical(self, content: str, data: Optional[Dict[str, str]] = None) -> None:
-        self._log(LogLevel.CRITICAL, content, data)
+    def enable_sampling(self, rates: Dict[LogLevel, float]) -> None:
+        self.sampler = LevelSampler(rates)
 
-    def error(self, content: str, data: Optional[Dict[str, str]] = None) -> None:
-        self._log(LogLevel.ERROR, content, data)
+    def disable_suppression(self) -> None:
+        self._flush_suppressed()
+        self.suppressor = None
+        self.rate_limiter = None
+        self.sampler = None
 
-    def warning(self, content: str, data: Optional[Dict[str, str]] = None) -> None:
-        self._log(LogLevel.WARNING, content, data)
+    def suppression_counts(self) -> Dict[str, int]:
+        return {
+            "duplicates": self.suppressor.suppressed if self.suppressor else 0,
+            "rate_limited": self.rate_limiter.suppressed if self.rate_limiter else 0,
+            "sampled_out": self.sampler.sampled_out if self.sampler else 0,
+        }
 
-    def notice(self, content: str, data: Optional[Dict[str, str]] = None) -> None:
-        self._log(LogLevel.NOTICE, content, data)
+    def enable_flight_recorder(self, capacity: int = 1000, min_level: LogLevel = LogLevel.TRACE, trigger_level: Optional[LogLevel] = LogLevel.ERROR) -> None:
+        self.recorder = FlightRecorder(capacity=capacity, min_level=min_level, trigger_level=trigger_level)
 
-    def info(self, content: str, data: Optional[Dict[str, str]] = None) -> None:
-        self._log(LogLevel.INFO, content, data)
+    def disable_flight_recorder(self) -> None:
+        self.recorder = None
 
-    def debug(self, content: str, data: Optional[Dict[str, str]] = None) -> None:
-        self._log(LogLevel.DEBUG, content, data)
+    def dump_flight_recorder(self) -> int:
+        recorder = self.recorder
+        if recorder is None:
+            return 0
+        records = recorder.drain()
+        if not records:
+            return 0
 
-    def trace(self, content: str, data: Optional[Dict[str, str]] = None) -> None:
-        self._log(LogLevel.TRACE, content, data)
+        self._dispatch(LogLevel.NOTICE, time.time(), f"Flight recorder: replaying {len(records)} buffered records", None, replay=True)
+        for _, timestamp, level, content, args, data, context in records:
+            data, args = _split_data(content, data, args)
+            if context is not None:
+                data = context if data is None else context.merged(data)
+            try:
+                if args or not isinstance(content, str):
+                    content = self._render_message(content, args)
+            except Exception as e:
+                content = f"<unrenderable record: {e!r}>"
+            self._dispatch(level, timestamp, content, data, replay=True)
+        return len(records)
+
+    def enable_exception_dedup(self, window: float = 60.0, max_fingerprints: int = 1024) -> None:
+        self.exception_tracker = ExceptionTracker(window=window, max_fingerprints=max_fingerprints)
+
+    def disable_exception_dedup(self) -> None:
+        self.exception_tracker = None
+
+    def _exception_record(self, level: LogLevel, content: Message, args: Tuple[Any, ...], data: Optional[Dict[str, str]], exc_info: Any) -> Optional[Tuple[str, Optional[Dict[str, str]]]]:
+        if level < self._threshold:
+            return None
+        if isinstance(exc_info, BaseException):
+            exc = exc_info
+        elif isinstance(exc_info, tuple):
+            exc = exc_info[1]
+        elif exc_info:
+            exc = sys.exc_info()[1]
+        else:
+            exc = None
+
+        data, args = _split_data(content, data, args)
+        message = self._render_message(content, args)
+        if exc is None:
+            return message, data
+
+        fingerprint = self.tracebacks.fingerprint(exc)
+        tracker = self.exception_tracker
+        first, count = tracker.check(fingerprint) if tracker is not None else (True, 1)
+        details = {"exception": type(exc).__qualname__, "fingerprint": fingerprint}
+        if first:
+            message = f"{message} [{fingerprint}]\n{self.tracebacks.render(exc).rstrip()}"
+        else:
+            summary = traceback_summary(exc)
+            message = f"{message} [{fingerprint} seen {count} times in {tracker.window:g}s, traceback suppressed] {summary}"
+            details["occurrences"] = str(count)
+        return message, details if data is None else {**data, **details}
+
+    def _emit_repeat_summary(self, summary: Tuple[LogLevel, int], timestamp: float) -> None:
+        level, repeats = summary
+        self._dispatch(level, timestamp, f"Previous message repeated {repeats} times", None)
+
+    def _flush_suppressed(self) -> None:
+        suppressor = self.suppressor
+        if suppressor is not None:
+            summary = suppressor.drain()
+            if summary:
+                self._emit_repeat_summary(summary, time.time())
+
+    def _log(self, level: LogLevel, content: Message, data: Optional[Dict[str, str]] = None, args: Tuple[Any, ...] = (), context: Optional[BoundContext] = None) -> None:
+        if level < self._threshold:
+            recorder = self.recorder
+            if recorder is not None and level >= recorder.min_level:
+                recorder.capture(level, content, data, args, context)
+            return
+
+        recorder = self.recorder
+        if recorder is not None and recorder.trigger_level is not None and level >= recorder.trigger_level:
+            self.dump_flight_recorder()
+
+        data, args = _split_data(content, data, args)
+        if context is not None:
+            data = context if data is None else context.merged(data)
+
+        if self.sampler is not None and not self.sampler.keep(level):
+            return
+
+        rate_suppressed = 0
+        rate_limiter = self.rate_limiter
+        if rate_limiter is not None:
+            if rate_limiter.by_call_site:
+                frame = sys._getframe(2)
+                key = (frame.f_code, frame.f_lineno)
+            else:
+                key = (level, content)
+            allowed, rate_suppressed = rate_limiter.acquire(key)
+            if not allowed:
+                return
+
+        timestamp = time.time()
+        suppressor = self.suppressor
+        if suppressor is not None:
+            emit, summary = suppressor.check(level, content, args, timestamp)
+            if summary:
+                self._emit_repeat_summary(summary, timestamp)
+            if not emit:
+                return
+
+        template = None
+        if args or not isinstance(content, str):
+            if args and self._keep_templates and isinstance(content, str):
+                args = tuple(arg() if callable(arg) else arg for arg in args)
+                template = (content, args)
+            content = self._render_message(content, args)
+        if rate_suppressed:
+            content = f"{content} [{rate_suppressed} similar messages suppressed]"
+            template = None
+
+        self._dispatch(level, timestamp, content, data, template)
+
+    def _dispatch(self, level: LogLevel, timestamp: float, content: str, data: Optional[Dict[str, str]], template: Optional[Tuple[str, Tuple[Any, ...]]] = None, replay: bool = False) -> None:
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.incr(("records", level))
+        writer_queue = self._writer_queue
+        if writer_queue is not None:
+            writer_queue.put((level, timestamp, content, data, template, replay))
+        else:
+            self._emit(level, timestamp, content, data, template, replay)
+
+    def enable_metrics(self) -> None:
+        if self.metrics is None:
+            self.metrics = Metrics()
+
+    def disable_metrics(self) -> None:
+        self.disable_metrics_export()
+        self.metrics = None
+
+    def stats(self) -> Dict[str, Any]:
+        metrics = self.metrics or Metrics()
+        writer_queue = self._writer_queue
+        sinks = {}
+        for name, sink in self.sinks.items():
+            sink_stats = {"level": LogLevel(sink.level).name, "format": sink.format, "enabled": sink.enabled}
+            if sink.local:
+                sink_stats["writes"] = metrics.counter(("writes", name))
+                sink_stats["write_latency"] = metrics.histogram(("write_seconds", name))
+            if hasattr(sink, "stats"):
+                sink_stats.update(sink.stats())
+            sinks[name] = sink_stats
+        return {
+            "records": {level.name: metrics.counter(("records", level)) for level in LogLevel},
+            "suppressed": self.suppression_counts(),
+            "writer_queue_depth": writer_queue.qsize() if writer_queue is not None else 0,
+            "sinks": sinks,
+        }
+
+    def enable_metrics_export(self, path: str, interval: float = 15.0) -> None:
+        self.disable_metrics_export()
+        self.enable_metrics()
+        self._exporter = TextfileExporter(lambda: render_prometheus(self.stats(), self.service_name), path, interval)
+        self._exporter.start()
+
+    def disable_metrics_export(self) -> None:
+        exporter, self._exporter = self._exporter, None
+        if exporter is not None:
+            exporter.stop()
+
+    def flush(self) -> None:
+        self._flush_suppressed()
+        writer_queue = self._writer_queue
+        if writer_queue is not None:
+            writer_queue.join()
+        for sink in list(self.sinks.values()):
+            sink.flush()
+
+    def close(self) -> None:
+        self._flush_suppressed()
+        self.disable_async_logging()
+        self.disable_metrics_export()
+        self.disable_file_logging()
+        self.disable_api_logging()
+        for name in [name for name in self.sinks if name != "console"]:
+            self.remove_sink(name).close()
+
+    def fatal(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._log(LogLevel.FATAL, content, data, args)
+
+    def critical(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._log(LogLevel.CRITICAL, content, data, args)
+
+    def error(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._log(LogLevel.ERROR, content, data, args)
+
+    def warning(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._log(LogLevel.WARNING, content, data, args)
+
+    def notice(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._log(LogLevel.NOTICE, content, data, args)
+
+    def info(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._log(LogLevel.INFO, content, data, args)
+
+    def debug(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._log(LogLevel.DEBUG, content, data, args)
+
+    def trace(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._log(LogLevel.TRACE, content, data, args)
+
+    def exception(self, content: Message = "Unhandled exception", *args: Any, data: Optional[Dict[str, str]] = None, exc_info: Any = True, level: LogLevel = LogLevel.ERROR) -> None:
+        record = self._exception_record(level, content, args, data, exc_info)
+        if record is not None:
+            self._log(level, record[0], record[1])
     
+    def bind(self, **context: Any) -> "BoundLogger":
+        return BoundLogger(self, BoundContext(context))
+
     def logAPI(self, level: LogLevel, message: str, data: Optional[Dict[str, str]] = None) -> bool:
         if not self.log_to_api or not self.api_handler:
             return False
@@ -92,4 +555,48 @@ class Logger:
             self.file_handler.close()
 
 
+class BoundLogger:
+    def __init__(self, logger: Logger, context: BoundContext):
+        self._logger = logger
+        self.context = context
+
+    def bind(self, **context: Any) -> "BoundLogger":
+        return BoundLogger(self._logger, BoundContext({**self.context, **context}))
+
+    def is_enabled(self, level: LogLevel) -> bool:
+        return self._logger.is_enabled(level)
+
+    def fatal(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._logger._log(LogLevel.FATAL, content, data, args, self.context)
+
+    def critical(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._logger._log(LogLevel.CRITICAL, content, data, args, self.context)
+
+    def error(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._logger._log(LogLevel.ERROR, content, data, args, self.context)
+
+    def warning(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._logger._log(LogLevel.WARNING, content, data, args, self.context)
+
+    def notice(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._logger._log(LogLevel.NOTICE, content, data, args, self.context)
+
+    def info(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._logger._log(LogLevel.INFO, content, data, args, self.context)
+
+    def debug(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._logger._log(LogLevel.DEBUG, content, data, args, self.context)
+
+    def trace(self, content: Message, *args: Any, data: Optional[Dict[str, str]] = None) -> None:
+        self._logger._log(LogLevel.TRACE, content, data, args, self.context)
+
+    def exception(self, content: Message = "Unhandled exception", *args: Any, data: Optional[Dict[str, str]] = None, exc_info: Any = True, level: LogLevel = LogLevel.ERROR) -> None:
+        record = self._logger._exception_record(level, content, args, data, exc_info)
+        if record is not None:
+            self._logger._log(level, record[0], record[1], (), self.context)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._logger, name)
+
+
 log = Logger() 
\ No newline at end of file
@@ -0,0 +1,208 @@
+import os
+import bisect
+from threading import Event, Lock, Thread, current_thread, local
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+
+LATENCY_BUCKETS = (
+    1e-06, 2.5e-06, 5e-06, 1e-05, 2.5e-05, 5e-05, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+
+
+class _Shard:
+    __slots__ = ("counters", "histograms")
+
+    def __init__(self):
+        self.counters: Dict[Hashable, int] = {}
+        self.histograms: Dict[Hashable, List[float]] = {}
+
+
+class Metrics:
+    def __init__(self, buckets: tuple = LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._local = local()
+        self._shards: List[Tuple[Thread, _Shard]] = []
+        self._retired = _Shard()
+        self._lock = Lock()
+
+    def _shard(self) -> _Shard:
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _Shard()
+            with self._lock:
+                self._retire_finished_locked()
+                self._shards.append((current_thread(), shard))
+        return shard
+
+    def _retire_finished_locked(self) -> None:
+        live = []
+        retired = self._retired
+        for thread, shard in self._shards:
+            if thread.is_alive():
+                live.append((thread, shard))
+                continue
+            for key, value in shard.counters.items():
+                retired.counters[key] = retired.counters.get(key, 0) + value
+            for key, values in shard.histograms.items():
+                merged = retired.histograms.get(key)
+                if merged is None:
+                    retired.histograms[key] = list(values)
+                else:
+                    for index, value in enumerate(values):
+                        merged[index] += value
+        self._shards = live
+
+    def incr(self, key: Hashable, amount: int = 1) -> None:
+        counters = self._shard().counters
+        counters[key] = counters.get(key, 0) + amount
+
+    def observe(self, key: Hashable, seconds: float) -> None:
+        histograms = self._shard().histograms
+        values = histograms.get(key)
+        if values is None:
+            values = histograms[key] = [0] * (len(self.buckets) + 1) + [0.0]
+        values[bisect.bisect_left(self.buckets, seconds)] += 1
+        values[-1] += seconds
+
+    def counter(self, key: Hashable) -> int:
+        with self._lock:
+            self._retire_finished_locked()
+            return self._retired.counters.get(key, 0) + sum(shard.counters.get(key, 0) for _, shard in self._shards)
+
+    def histogram(self, key: Hashable) -> Dict[str, Any]:
+        merged = [0] * (len(self.buckets) + 1) + [0.0]
+        with self._lock:
+            self._retire_finished_locked()
+            for shard in [self._retired] + [shard for _, shard in self._shards]:
+                values = shard.histograms.get(key)
+                if values is not None:
+                    for index, value in enumerate(list(values)):
+                        merged[index] += value
+
+        total = sum(merged[:-1])
+        buckets = []
+        running = 0
+        for bound, count in zip(self.buckets + (float("inf"),), merged[:-1]):
+            running += count
+            buckets.append((bound, running))
+        return {
+            "count": total,
+            "sum": merged[-1],
+            "p50": self._quantile(buckets, total, 0.50),
+            "p99": self._quantile(buckets, total, 0.99),
+            "buckets": buckets,
+        }
+
+    def _quantile(self, buckets: List[tuple], total: int, fraction: float) -> Optional[float]:
+        if not total:
+            return None
+        rank = total * fraction
+        for bound, cumulative in buckets:
+            if cumulative >= rank:
+                return bound if bound != float("inf") else self.buckets[-1]
+        return self.buckets[-1]
+
+
+def _labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{value}"' for name, value in labels.items()) + "}"
+
+
+def _number(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+class _PrometheusWriter:
+    def __init__(self, base_labels: Dict[str, str]):
+        self.base_labels = base_labels
+        self.lines: List[str] = []
+        self._declared = set()
+
+    def _declare(self, name: str, kind: str) -> None:
+        if name not in self._declared:
+            self._declared.add(name)
+            self.lines.append(f"# TYPE {name} {kind}")
+
+    def sample(self, name: str, kind: str, value: float, **labels: str) -> None:
+        self._declare(name, kind)
+        self.lines.append(f"{name}{_labels({**self.base_labels, **labels})} {_number(value)}")
+
+    def histogram(self, name: str, summary: Dict[str, Any], **labels: str) -> None:
+        self._declare(name, "histogram")
+        labels = {**self.base_labels, **labels}
+        for bound, cumulative in summary["buckets"]:
+            self.lines.append(f"{name}_bucket{_labels({**labels, 'le': _number(bound)})} {cumulative}")
+        self.lines.append(f"{name}_sum{_labels(labels)} {_number(summary['sum'])}")
+        self.lines.append(f"{name}_count{_labels(labels)} {summary['count']}")
+
+
+def render_prometheus(stats: Dict[str, Any], service: str) -> str:
+    writer = _PrometheusWriter({"service": service})
+    for level, count in stats["records"].items():
+        writer.sample("logger_records_total", "counter", count, level=level)
+    for reason, count in stats["suppressed"].items():
+        writer.sample("logger_suppressed_total", "counter", count, reason=reason)
+    writer.sample("logger_writer_queue_depth", "gauge", stats["writer_queue_depth"])
+
+    for sink, sink_stats in stats["sinks"].items():
+        if "writes" in sink_stats:
+            writer.sample("logger_sink_writes_total", "counter", sink_stats["writes"], sink=sink)
+            writer.histogram("logger_sink_write_seconds", sink_stats["write_latency"], sink=sink)
+        if "queue_depth" in sink_stats:
+            writer.sample("logger_sink_queue_depth", "gauge", sink_stats["queue_depth"], sink=sink)
+            writer.sample("logger_sink_queue_capacity", "gauge", sink_stats["queue_capacity"], sink=sink)
+        for reason, count in sink_stats.get("dropped", {}).items():
+            writer.sample("logger_sink_dropped_total", "counter", count, sink=sink, reason=reason)
+        for result, count in sink_stats.get("delivery", {}).items():
+            writer.sample("logger_sink_delivery_total", "counter", count, sink=sink, result=result)
+        if "post_latency" in sink_stats:
+            writer.histogram("logger_sink_post_seconds", sink_stats["post_latency"], sink=sink)
+    return "\n".join(writer.lines) + "\n"
+
+
+class TextfileExporter:
+    def __init__(self, render: Callable[[], str], path: str, interval: float = 15.0):
+        self.render = render
+        self.path = path
+        self.interval = interval
+        self._stop = Event()
+        self._thread = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.export()
+            except Exception:
+                pass
+
+    def export(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(self.render())
+        os.replace(temp_path, self.path)
+
+    def stop(self) -> None:
+        thread = self._thread
+        if thread is None:
+            return
+        self._thread = None
+        self._stop.set()
+        thread.join()
+        try:
+            self.export()
+        except Exception:
+            pass
@@ -0,0 +1,272 @@
+import os
+import re
+import sys
+import gzip
+import json
+import mmap
+import bisect
+import argparse
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Sequence
+
+from .levels import LogLevel
+from .formatter import Formatter
+from .binary import is_binary_file, read_file
+from .rotation import INDEX_SUFFIX, LogFile, list_log_files
+
+
+INDEX_VERSION = "v1"
+PLAIN_LINE_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}(?:\.\d+)?) \[(\w+)\s*\] (.*)$", re.DOTALL)
+BOUND_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:[ T](\d{2}):(\d{2})(?::(\d{2})(\.\d+)?)?)?$")
+JSON_TIMESTAMP_KEY = b'"timestamp":"'
+ORDER_SLACK = 5.0
+
+
+class QueryRecord(NamedTuple):
+    timestamp: str
+    level: str
+    message: str
+    line: str
+
+
+def parse_bound(text: str, is_end: bool = False) -> str:
+    match = BOUND_PATTERN.match(text.strip())
+    if not match:
+        raise ValueError(f"invalid time bound {text!r}, expected YYYY-MM-DD[ HH:MM[:SS[.ffffff]]]")
+    date, hour, minute, second, fraction = match.groups()
+    if hour is None:
+        return f"{date} 23:59:59.999999" if is_end else f"{date} 00:00:00"
+    if second is None:
+        return f"{date} {hour}:{minute}:59.999999" if is_end else f"{date} {hour}:{minute}:00"
+    if fraction is None and is_end:
+        fraction = ".999999"
+    return f"{date} {hour}:{minute}:{second}{fraction or ''}"
+
+
+def shift_timestamp(timestamp: str, seconds: float) -> str:
+    shifted = datetime.strptime(timestamp[:19], "%Y-%m-%d %H:%M:%S") + timedelta(seconds=float("0" + timestamp[19:]) + seconds)
+    return shifted.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+
+def line_timestamp(line: bytes) -> Optional[str]:
+    if line[:1] == b"{":
+        start = line.find(JSON_TIMESTAMP_KEY)
+        if start < 0:
+            return None
+        start += len(JSON_TIMESTAMP_KEY)
+        end = line.find(b'"', start)
+        timestamp = line[start:end]
+    else:
+        timestamp = line[:19]
+        if len(line) > 19 and line[19:20] == b".":
+            timestamp = line[:line.find(b" ", 19)]
+    if len(timestamp) < 19 or timestamp[4:5] != b"-" or timestamp[10:11] != b" ":
+        return None
+    return timestamp.decode("ascii", "replace")
+
+
+def parse_record(line: str) -> Optional[QueryRecord]:
+    if line.startswith("{"):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        return QueryRecord(record.get("timestamp", ""), record.get("level", ""), record.get("message", ""), line)
+    match = PLAIN_LINE_PATTERN.match(line)
+    if not match:
+        return None
+    timestamp, level, message = match.groups()
+    return QueryRecord(timestamp, level, message, line)
+
+
+class LogIndex:
+    def __init__(self, path: str, interval: int = 64 * 1024):
+        self.path = path
+        self.index_path = path + INDEX_SUFFIX
+        self.interval = interval
+        self.inode = None
+        self.indexed_size = 0
+        self.timestamps: List[str] = []
+        self.offsets: List[int] = []
+
+    def load(self) -> None:
+        try:
+            with open(self.index_path, "r", encoding="ascii") as f:
+                version, inode, indexed_size = f.readline().split()
+                if version != INDEX_VERSION:
+                    return
+                timestamps, offsets = [], []
+                for entry in f:
+                    timestamp, offset = entry.rstrip("\n").split("\t")
+                    timestamps.append(timestamp)
+                    offsets.append(int(offset))
+        except (OSError, ValueError):
+            return
+        self.inode, self.indexed_size = int(inode), int(indexed_size)
+        self.timestamps, self.offsets = timestamps, offsets
+
+    def save(self) -> None:
+        temp_path = f"{self.index_path}.tmp"
+        with open(temp_path, "w", encoding="ascii") as f:
+            f.write(f"{INDEX_VERSION} {self.inode} {self.indexed_size}\n")
+            f.writelines(f"{timestamp}\t{offset}\n" for timestamp, offset in zip(self.timestamps, self.offsets))
+        os.replace(temp_path, self.index_path)
+
+    def update(self, data: Sequence[int], inode: int) -> None:
+        if inode != self.inode or len(data) < self.indexed_size:
+            self.inode, self.indexed_size = inode, 0
+            self.timestamps, self.offsets = [], []
+
+        complete = data.rfind(b"\n") + 1 if len(data) else 0
+        if complete <= self.indexed_size:
+            return
+
+        position = self.indexed_size
+        while position < complete:
+            if self.offsets and position < self.offsets[-1] + self.interval:
+                line_end = data.find(b"\n", self.offsets[-1] + self.interval - 1, complete)
+                if line_end < 0:
+                    break
+                position = line_end + 1
+                continue
+            line_end = data.find(b"\n", position, complete)
+            timestamp = line_timestamp(data[position:min(line_end, position + 512)])
+            if timestamp is not None:
+                self.timestamps.append(timestamp)
+                self.offsets.append(position)
+            position = line_end + 1
+        self.indexed_size = complete
+        self.save()
+
+    def seek_offset(self, start: Optional[str], slack: float = 0.0) -> int:
+        if start is None or not self.timestamps:
+            return 0
+        if slack:
+            start = shift_timestamp(start, -slack)
+        position = bisect.bisect_left(self.timestamps, start) - 1
+        return self.offsets[position] if position >= 0 else 0
+
+
+def _records(lines: Iterable[str]) -> Iterator[QueryRecord]:
+    pending = None
+    for line in lines:
+        record = parse_record(line)
+        if record is not None:
+            if pending is not None:
+                yield pending
+            pending = record
+        elif pending is not None:
+            pending = pending._replace(message=f"{pending.message}\n{line}", line=f"{pending.line}\n{line}")
+    if pending is not None:
+        yield pending
+
+
+def _plain_file_lines(path: str, start: Optional[str], index_interval: int, slack: float) -> Iterator[str]:
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            index = LogIndex(path, interval=index_interval)
+            index.load()
+            try:
+                index.update(data, os.fstat(f.fileno()).st_ino)
+            except OSError:
+                pass
+            position = index.seek_offset(start, slack)
+            while position < size:
+                line_end = data.find(b"\n", position)
+                if line_end < 0:
+                    line_end = size
+                yield data[position:line_end].decode("utf-8", "replace")
+                position = line_end + 1
+
+
+def _compressed_file_lines(path: str) -> Iterator[str]:
+    with gzip.open(path, "rt", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            yield line.rstrip("\n")
+
+
+def _binary_file_lines(path: str) -> Iterator[str]:
+    formatter = Formatter(precision="us")
+    for record in read_file(path):
+        yield formatter.format_plain(record.level, record.message, record.timestamp)
+
+
+def _files_in_range(log_dir: str, start: Optional[str], end: Optional[str]) -> List[LogFile]:
+    start_date = start[:10] if start else None
+    end_date = end[:10] if end else None
+    return [
+        log_file for log_file in list_log_files(log_dir)
+        if (start_date is None or log_file.date >= start_date) and (end_date is None or log_file.date <= end_date)
+    ]
+
+
+def query(log_dir: str, start: Optional[str] = None, end: Optional[str] = None, min_level: Optional[LogLevel] = None, contains: Optional[str] = None, limit: Optional[int] = None, index_interval: int = 64 * 1024, order_slack: float = ORDER_SLACK) -> Iterator[QueryRecord]:
+    start = parse_bound(start) if start else None
+    end = parse_bound(end, is_end=True) if end else None
+    stop_after = shift_timestamp(end, order_slack) if end else None
+    allowed_levels = None
+    if min_level is not None:
+        allowed_levels = {level.name for level in LogLevel if level >= min_level}
+
+    matched = 0
+    for log_file in _files_in_range(log_dir, start, end):
+        if is_binary_file(log_file.path):
+            lines = _binary_file_lines(log_file.path)
+        elif log_file.compressed:
+            lines = _compressed_file_lines(log_file.path)
+        else:
+            lines = _plain_file_lines(log_file.path, start, index_interval, order_slack)
+        for record in _records(lines):
+            if start is not None and record.timestamp < start:
+                continue
+            if end is not None and record.timestamp > end:
+                if record.timestamp > stop_after:
+                    break
+                continue
+            if allowed_levels is not None and record.level not in allowed_levels:
+                continue
+            if contains is not None and contains not in record.message:
+                continue
+            yield record
+            matched += 1
+            if limit is not None and matched >= limit:
+                return
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m logger.query", description="Query daily log files by time range, level and text.")
+    parser.add_argument("--dir", default="logs", help="log directory (default: logs)")
+    parser.add_argument("--since", help="start time, YYYY-MM-DD[ HH:MM[:SS]]")
+    parser.add_argument("--until", help="end time (inclusive), YYYY-MM-DD[ HH:MM[:SS]]")
+    parser.add_argument("--level", type=str.upper, choices=[level.name for level in LogLevel], help="minimum level")
+    parser.add_argument("--grep", help="substring the message must contain")
+    parser.add_argument("--limit", type=int, help="stop after this many records")
+    parser.add_argument("--json", action="store_true", help="print records as JSON objects")
+    args = parser.parse_args(argv)
+
+    try:
+        records = query(
+            args.dir,
+            start=args.since,
+            end=args.until,
+            min_level=LogLevel[args.level] if args.level else None,
+            contains=args.grep,
+            limit=args.limit
+        )
+        for record in records:
+            if args.json:
+                print(json.dumps(record._asdict(), ensure_ascii=False))
+            else:
+                print(record.line)
+    except ValueError as e:
+        parser.error(str(e))
+    except BrokenPipeError:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,38 @@
+import time
+import itertools
+from threading import Lock
+from typing import Any, List, Optional, Tuple
+
+from .levels import LogLevel
+
+
+class FlightRecorder:
+    def __init__(self, capacity: int = 1000, min_level: LogLevel = LogLevel.TRACE, trigger_level: Optional[LogLevel] = LogLevel.ERROR):
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.capacity = capacity
+        self.min_level = min_level
+        self.trigger_level = trigger_level
+        self.dumps = 0
+        self._slots: List[Optional[Tuple[Any, ...]]] = [None] * capacity
+        self._sequence = itertools.count(1)
+        self._dumped_through = 0
+        self._dump_lock = Lock()
+
+    def capture(self, level: LogLevel, content: Any, data: Any, args: Tuple[Any, ...], context: Any = None) -> None:
+        sequence = next(self._sequence)
+        self._slots[sequence % self.capacity] = (sequence, time.time(), level, content, args, data, context)
+
+    def drain(self) -> List[Tuple[Any, ...]]:
+        with self._dump_lock:
+            records = sorted(
+                (record for record in list(self._slots) if record is not None and record[0] > self._dumped_through),
+                key=lambda record: record[0]
+            )
+            if records:
+                self._dumped_through = records[-1][0]
+                self.dumps += 1
+            return records
+
+    def captured(self) -> int:
+        return sum(1 for record in list(self._slots) if record is not None)
@@ -0,0 +1,158 @@
+import os
+import re
+import gzip
+import time
+import shutil
+import datetime
+from queue import Queue
+from threading import Thread, Event
+from typing import List, NamedTuple, Optional
+
+
+LOG_FILE_PATTERN = re.compile(r"^(\d{4}-\d{2}-\d{2})(?:\.(\d+))?\.log(\.gz)?$")
+INDEX_SUFFIX = ".idx"
+
+
+class LogFile(NamedTuple):
+    path: str
+    date: str
+    segment: Optional[int]
+    compressed: bool
+
+    @property
+    def sort_key(self):
+        return (self.date, self.segment if self.segment is not None else float("inf"), self.compressed)
+
+
+def segment_file_name(date: str, segment: int) -> str:
+    return f"{date}.{segment}.log"
+
+
+def list_log_files(log_dir: str) -> List[LogFile]:
+    try:
+        names = os.listdir(log_dir)
+    except FileNotFoundError:
+        return []
+
+    log_files = []
+    for name in names:
+        match = LOG_FILE_PATTERN.match(name)
+        if match:
+            date, segment, compressed = match.groups()
+            log_files.append(LogFile(
+                path=os.path.join(log_dir, name),
+                date=date,
+                segment=int(segment) if segment else None,
+                compressed=bool(compressed),
+            ))
+    log_files.sort(key=lambda log_file: log_file.sort_key)
+    return log_files
+
+
+class LogArchiver:
+    def __init__(self, log_dir: str, compress: bool = True, compress_level: int = 6, retention_days: Optional[int] = None, max_total_bytes: Optional[int] = None):
+        self.log_dir = log_dir
+        self.compress = compress
+        self.compress_level = compress_level
+        self.retention_days = retention_days
+        self.max_total_bytes = max_total_bytes
+        self.active_path = None
+        self._jobs = Queue()
+        self._worker_thread = None
+        self._closing = Event()
+
+    def submit(self, closed_path: Optional[str] = None, delay: float = 0.0) -> None:
+        if self._worker_thread is None:
+            self._closing.clear()
+            self._worker_thread = Thread(target=self._worker, daemon=True)
+            self._worker_thread.start()
+        self._jobs.put(("archive", closed_path, time.monotonic() + delay))
+
+    def _worker(self) -> None:
+        while True:
+            kind, closed_path, due = self._jobs.get()
+            try:
+                if kind == "stop":
+                    break
+                remaining = due - time.monotonic()
+                if remaining > 0:
+                    self._closing.wait(remaining)
+                if closed_path and self.compress:
+                    self.compress_file(closed_path)
+                self.prune()
+            except Exception:
+                pass
+            finally:
+                self._jobs.task_done()
+
+    def compress_file(self, path: str) -> Optional[str]:
+        if not os.path.exists(path):
+            return None
+        compressed_path = f"{path}.gz"
+        temp_path = f"{compressed_path}.tmp"
+        try:
+            fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL)
+        except FileExistsError:
+            return None
+        try:
+            if os.path.exists(compressed_path) or not os.path.exists(path):
+                return None
+            with open(path, "rb") as source, open(fd, "wb", closefd=False) as raw, gzip.GzipFile(fileobj=raw, mode="wb", compresslevel=self.compress_level) as target:
+                shutil.copyfileobj(source, target, 1024 * 1024)
+            os.replace(temp_path, compressed_path)
+        finally:
+            os.close(fd)
+            self._remove(temp_path)
+        self._remove(path)
+        self._remove(path + INDEX_SUFFIX)
+        return compressed_path
+
+    def prune(self) -> None:
+        log_files = [
+            log_file for log_file in list_log_files(self.log_dir)
+            if log_file.path != self.active_path
+        ]
+
+        if self.retention_days is not None:
+            cutoff = (datetime.date.today() - datetime.timedelta(days=self.retention_days)).strftime("%Y-%m-%d")
+            for log_file in [log_file for log_file in log_files if log_file.date < cutoff]:
+                self._remove(log_file.path)
+                self._remove(log_file.path + INDEX_SUFFIX)
+                log_files.remove(log_file)
+
+        if self.max_total_bytes is not None:
+            sizes = {log_file.path: self._size(log_file.path) for log_file in log_files}
+            total = sum(sizes.values())
+            if self.active_path:
+                total += self._size(self.active_path)
+            for log_file in log_files:
+                if total <= self.max_total_bytes:
+                    break
+                self._remove(log_file.path)
+                self._remove(log_file.path + INDEX_SUFFIX)
+                total -= sizes[log_file.path]
+
+    def _size(self, path: str) -> int:
+        try:
+            return os.path.getsize(path)
+        except OSError:
+            return 0
+
+    def _remove(self, path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    def wait(self) -> None:
+        if self._worker_thread is not None:
+            self._jobs.join()
+
+    def close(self) -> None:
+        worker_thread = self._worker_thread
+        if worker_thread is None:
+            return
+        self._worker_thread = None
+        self._closing.set()
+        self._jobs.put(("stop", None, 0.0))
+        worker_thread.join()
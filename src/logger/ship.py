@@ -0,0 +1,298 @@
+import os
+import sys
+import gzip
+import json
+import time
+import hashlib
+import argparse
+from threading import Event
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .dto import LogDTO
+from .api_handler import APIHandler, NexusRejected
+from .binary import is_binary_file
+from .query import PLAIN_LINE_PATTERN
+from .rotation import LogFile, list_log_files
+from .spool import CircuitBreaker
+
+
+CHECKPOINT_NAME = ".ship.checkpoint"
+
+
+def parse_timestamp(text: str) -> float:
+    created = time.mktime(time.strptime(text[:19], "%Y-%m-%d %H:%M:%S"))
+    return created + float("0" + text[19:]) if len(text) > 20 else created
+
+
+def record_id(file_id: str, offset: int, created: float) -> str:
+    millis = int(created * 1000) & 0xFFFFFFFFFFFF
+    digest = int.from_bytes(hashlib.sha1(f"{file_id}:{offset}".encode("ascii")).digest()[:10], "big")
+    return "%08x-%04x-%04x-%04x-%012x" % (
+        millis >> 16,
+        millis & 0xFFFF,
+        0x7000 | (digest >> 68),
+        0x8000 | ((digest >> 48) & 0x3FFF),
+        digest & 0xFFFFFFFFFFFF,
+    )
+
+
+def parse_line(text: str, service_name: str) -> Optional[LogDTO]:
+    if text.startswith("{"):
+        try:
+            record = json.loads(text)
+            created = parse_timestamp(record["timestamp"])
+        except (ValueError, KeyError, TypeError):
+            return None
+        data = record.get("data") or {}
+        return LogDTO(
+            level=record.get("level", "INFO"),
+            service=record.get("service") or service_name,
+            message=record.get("message", ""),
+            data={key: str(value) for key, value in data.items()} if isinstance(data, dict) else {},
+            created=created,
+        )
+    match = PLAIN_LINE_PATTERN.match(text)
+    if not match:
+        return None
+    timestamp, level, message = match.groups()
+    try:
+        created = parse_timestamp(timestamp)
+    except ValueError:
+        return None
+    return LogDTO(level=level, service=service_name, message=message, created=created)
+
+
+class LogShipper:
+    def __init__(self, log_dir: str = "logs", nexus_url: Optional[str] = None, service_name: str = "qtb", checkpoint_path: Optional[str] = None, batch_size: int = 500, batch_max_bytes: int = 1024 * 1024, max_rate: float = 0.0, poll_interval: float = 1.0, tail_settle: float = 1.0, timeout: float = 2, retry_base_delay: float = 1.0, retry_max_delay: float = 60.0):
+        self.log_dir = log_dir
+        self.service_name = service_name
+        self.checkpoint_path = checkpoint_path or os.path.join(log_dir, CHECKPOINT_NAME)
+        self.batch_size = max(1, batch_size)
+        self.batch_max_bytes = batch_max_bytes
+        self.max_rate = max_rate
+        self.poll_interval = poll_interval
+        self.tail_settle = tail_settle
+        self.client = APIHandler(service_name=service_name, timeout=timeout)
+        if nexus_url:
+            self.client.nexus_url = nexus_url
+        self.breaker = CircuitBreaker(1, retry_base_delay, retry_max_delay)
+        self.checkpoint = self._load_checkpoint()
+        self._counts = {"shipped": 0, "batches": 0, "failed_batches": 0, "rejected": 0, "skipped_lines": 0, "skipped_binary": 0, "checkpoint_lost": 0}
+        self._rate_started = None
+        self._rate_shipped = 0
+        self._stop = Event()
+
+    def _load_checkpoint(self) -> Optional[Tuple[str, str, int]]:
+        try:
+            with open(self.checkpoint_path, "r") as f:
+                date, file_id, offset = f.read().split()
+            return date, file_id, int(offset)
+        except (OSError, ValueError):
+            return None
+
+    def _save_checkpoint(self, date: str, file_id: str, offset: int) -> None:
+        temp_path = f"{self.checkpoint_path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(f"{date} {file_id} {offset}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.checkpoint_path)
+        self.checkpoint = (date, file_id, offset)
+
+    def _open(self, log_file: LogFile):
+        if log_file.compressed:
+            return gzip.open(log_file.path, "rb")
+        return open(log_file.path, "rb")
+
+    def _file_id(self, log_file: LogFile) -> Optional[str]:
+        try:
+            with self._open(log_file) as f:
+                first_line = f.readline()
+        except (OSError, EOFError):
+            return None
+        if not first_line.endswith(b"\n"):
+            return None
+        return hashlib.sha1(first_line).hexdigest()[:16]
+
+    def _files(self) -> List[LogFile]:
+        log_files = list_log_files(self.log_dir)
+        plain_paths = {log_file.path for log_file in log_files if not log_file.compressed}
+        return [
+            log_file for log_file in log_files
+            if not (log_file.compressed and log_file.path[:-3] in plain_paths)
+        ]
+
+    def _start_position(self, log_files: List[LogFile]) -> Tuple[int, int]:
+        if self.checkpoint is None:
+            return 0, 0
+        date, file_id, offset = self.checkpoint
+        for index, log_file in enumerate(log_files):
+            if log_file.date == date and self._file_id(log_file) == file_id:
+                return index, offset
+        self._counts["checkpoint_lost"] += 1
+        for index, log_file in enumerate(log_files):
+            if log_file.date >= date:
+                return index, 0
+        return len(log_files), 0
+
+    def _records(self, log_file: LogFile, offset: int, active: bool) -> Iterator[Tuple[LogDTO, int, int]]:
+        with self._open(log_file) as f:
+            f.seek(offset)
+            pending = None
+            lines = []
+            position = offset
+            for line in f:
+                text = line.decode("utf-8", "replace").rstrip("\n")
+                record = parse_line(text, self.service_name)
+                if record is not None:
+                    if pending is not None:
+                        yield self._finish(pending, lines), pending[1], position
+                    pending = (record, position)
+                    lines = []
+                elif pending is not None:
+                    lines.append(text)
+                else:
+                    self._counts["skipped_lines"] += 1
+                position += len(line)
+
+            if pending is None:
+                return
+            if active:
+                settled = time.time() - os.path.getmtime(log_file.path) >= self.tail_settle
+                if not settled or not line.endswith(b"\n"):
+                    return
+            yield self._finish(pending, lines), pending[1], position
+
+    def _finish(self, pending: Tuple[LogDTO, int], lines: List[str]) -> LogDTO:
+        record = pending[0]
+        if lines:
+            record.message = "\n".join([record.message] + lines)
+        return record
+
+    def _throttle(self, records: int) -> None:
+        if self.max_rate <= 0:
+            return
+        now = time.monotonic()
+        if self._rate_started is None or now - self._rate_started > 1.0 + self._rate_shipped / self.max_rate:
+            self._rate_started, self._rate_shipped = now, 0
+        self._rate_shipped += records
+        delay = self._rate_started + self._rate_shipped / self.max_rate - now
+        if delay > 0:
+            self._stop.wait(delay)
+
+    def _post(self, batch: List[bytes]) -> bool:
+        if not self.breaker.allow():
+            return False
+        try:
+            self.client._post(b"[" + b",".join(batch) + b"]")
+        except NexusRejected:
+            self.breaker.record_success()
+            self._counts["rejected"] += len(batch)
+            return True
+        except Exception:
+            self.breaker.record_failure()
+            self._counts["failed_batches"] += 1
+            return False
+        self.breaker.record_success()
+        self._counts["shipped"] += len(batch)
+        self._counts["batches"] += 1
+        return True
+
+    def _ship_file(self, log_file: LogFile, file_id: str, offset: int, active: bool) -> Tuple[int, bool]:
+        shipped = 0
+        batch: List[bytes] = []
+        size = 0
+        end = offset
+        for record, start, record_end in self._records(log_file, offset, active):
+            record.id = record_id(file_id, start, record.created)
+            encoded = self.client._encode(record)
+            if batch and (len(batch) >= self.batch_size or size + len(encoded) > self.batch_max_bytes):
+                self._throttle(len(batch))
+                if not self._post(batch):
+                    return shipped, False
+                self._save_checkpoint(log_file.date, file_id, end)
+                shipped += len(batch)
+                batch, size = [], 0
+            batch.append(encoded)
+            size += len(encoded) + 1
+            end = record_end
+        if batch:
+            self._throttle(len(batch))
+            if not self._post(batch):
+                return shipped, False
+            self._save_checkpoint(log_file.date, file_id, end)
+            shipped += len(batch)
+        return shipped, True
+
+    def ship_once(self) -> int:
+        log_files = self._files()
+        index, offset = self._start_position(log_files)
+        shipped = 0
+        for position in range(index, len(log_files)):
+            log_file = log_files[position]
+            if position != index:
+                offset = 0
+            if not log_file.compressed and is_binary_file(log_file.path):
+                self._counts["skipped_binary"] += 1
+                continue
+            file_id = self._file_id(log_file)
+            if file_id is None:
+                break
+            active = position == len(log_files) - 1 and not log_file.compressed
+            count, completed = self._ship_file(log_file, file_id, offset, active)
+            shipped += count
+            if not completed:
+                break
+        return shipped
+
+    def run(self) -> None:
+        while not self._stop.is_set():
+            if not self.ship_once():
+                self._stop.wait(max(self.poll_interval, self.breaker.retry_in()))
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self._counts,
+            "circuit": self.breaker.state,
+            "checkpoint": self.checkpoint,
+            "post_latency": self.client.metrics.histogram("post_seconds"),
+        }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m logger.ship", description="Tail daily log files and ship their records to the nexus /logs endpoint.")
+    parser.add_argument("--dir", default="logs", help="log directory (default: logs)")
+    parser.add_argument("--url", help="nexus /logs endpoint (default: http://nexus-api:$NEXUS_PORT/logs)")
+    parser.add_argument("--service", default="qtb", help="service name for plain-format lines (default: qtb)")
+    parser.add_argument("--checkpoint", help=f"checkpoint file (default: <dir>/{CHECKPOINT_NAME})")
+    parser.add_argument("--batch-size", type=int, default=500, help="records per POST (default: 500)")
+    parser.add_argument("--max-rate", type=float, default=0.0, help="records per second cap, 0 for unlimited (default: 0)")
+    parser.add_argument("--poll-interval", type=float, default=1.0, help="seconds between polls when idle (default: 1.0)")
+    parser.add_argument("--once", action="store_true", help="ship what is available and exit")
+    args = parser.parse_args(argv)
+
+    shipper = LogShipper(
+        log_dir=args.dir,
+        nexus_url=args.url,
+        service_name=args.service,
+        checkpoint_path=args.checkpoint,
+        batch_size=args.batch_size,
+        max_rate=args.max_rate,
+        poll_interval=args.poll_interval,
+    )
+    try:
+        if args.once:
+            shipped = shipper.ship_once()
+            print(json.dumps({"shipped": shipped, **shipper.stats()}))
+        else:
+            shipper.run()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
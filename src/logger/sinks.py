@@ -0,0 +1,77 @@
+from typing import Any, Dict, Optional, TextIO
+
+from .levels import LogLevel
+
+
+FORMATS = ("colored", "plain", "json", "binary")
+
+
+class Sink:
+    local = True
+
+    def __init__(self, level: LogLevel = LogLevel.TRACE, format: str = "plain"):
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS}, got {format!r}")
+        self.level = level
+        self.format = format
+        self.enabled = True
+
+    def emit(self, level: LogLevel, message: str) -> None:
+        raise NotImplementedError
+
+    def flush(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+class StreamSink(Sink):
+    def __init__(self, stream: TextIO, level: LogLevel = LogLevel.TRACE, format: str = "colored"):
+        super().__init__(level=level, format=format)
+        self.stream = stream
+
+    def emit(self, level: LogLevel, message: str) -> None:
+        print(message, file=self.stream)
+        self.stream.flush()
+
+    def flush(self) -> None:
+        self.stream.flush()
+
+
+class FileSink(Sink):
+    def __init__(self, handler, level: LogLevel = LogLevel.TRACE):
+        super().__init__(level=level, format=handler.file_format)
+        self.handler = handler
+
+    def emit(self, level: LogLevel, message: Any) -> None:
+        if self.format == "binary":
+            self.handler.write_record(level, message)
+        else:
+            self.handler.write(message, level)
+
+    def flush(self) -> None:
+        self.handler.flush()
+
+    def close(self) -> None:
+        self.handler.close()
+
+
+class APISink(Sink):
+    local = False
+
+    def __init__(self, handler, level: LogLevel = LogLevel.TRACE):
+        super().__init__(level=level, format="json")
+        self.handler = handler
+
+    def send(self, level: LogLevel, timestamp: float, content: str, data: Optional[Dict[str, str]]) -> None:
+        self.handler.send_log(level, content, data, timestamp)
+
+    def flush(self) -> None:
+        self.handler.flush()
+
+    def close(self) -> None:
+        self.handler.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return self.handler.stats()
@@ -0,0 +1,199 @@
+import os
+import re
+import time
+from typing import List, Tuple
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, base_delay: float = 1.0, max_delay: float = 60.0):
+        self.failure_threshold = max(1, failure_threshold)
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.state = self.CLOSED
+        self.failures = 0
+        self._delay = base_delay
+        self._retry_at = 0.0
+
+    def allow(self) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN and time.monotonic() >= self._retry_at:
+            self.state = self.HALF_OPEN
+            return True
+        return False
+
+    def retry_in(self) -> float:
+        if self.state != self.OPEN:
+            return 0.0
+        return max(0.0, self._retry_at - time.monotonic())
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.failures = 0
+        self._delay = self.base_delay
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.state == self.HALF_OPEN:
+            self._delay = min(self._delay * 2, self.max_delay)
+            self._open()
+        elif self.state == self.CLOSED and self.failures >= self.failure_threshold:
+            self._delay = self.base_delay
+            self._open()
+
+    def _open(self) -> None:
+        self.state = self.OPEN
+        self._retry_at = time.monotonic() + self._delay
+
+
+class DiskSpool:
+    SEGMENT_PATTERN = re.compile(r"^spool-(\d{8})\.jsonl$")
+
+    def __init__(self, spool_dir: str, segment_bytes: int = 8 * 1024 * 1024, max_bytes: int = 256 * 1024 * 1024):
+        self.spool_dir = spool_dir
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.offset_path = os.path.join(spool_dir, "spool.offset")
+        self.dropped_records = 0
+        os.makedirs(spool_dir, exist_ok=True)
+
+        self._segments = sorted(
+            int(match.group(1)) for match in map(self.SEGMENT_PATTERN.match, os.listdir(spool_dir)) if match
+        )
+        self._read_segment, self._read_offset = self._load_offset()
+        for index in [index for index in self._segments if index < self._read_segment]:
+            self._remove_segment(index)
+        if not self._segments:
+            self._segments.append(self._read_segment)
+        elif self._read_segment < self._segments[0]:
+            self._read_segment, self._read_offset = self._segments[0], 0
+
+        self._sizes = {index: self._file_size(index) for index in self._segments}
+        self._repair_tail()
+        self._write_handle = None
+
+    def _segment_path(self, index: int) -> str:
+        return os.path.join(self.spool_dir, f"spool-{index:08d}.jsonl")
+
+    def _file_size(self, index: int) -> int:
+        try:
+            return os.path.getsize(self._segment_path(index))
+        except OSError:
+            return 0
+
+    def _load_offset(self) -> Tuple[int, int]:
+        try:
+            with open(self.offset_path, "r") as f:
+                segment, offset = f.read().split()
+            return int(segment), int(offset)
+        except (OSError, ValueError):
+            return (self._segments[0] if self._segments else 1), 0
+
+    def _save_offset(self) -> None:
+        temp_path = f"{self.offset_path}.tmp"
+        with open(temp_path, "w") as f:
+            f.write(f"{self._read_segment} {self._read_offset}")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.offset_path)
+
+    def _repair_tail(self) -> None:
+        index = self._segments[-1]
+        size = self._sizes[index]
+        if not size:
+            return
+        with open(self._segment_path(index), "rb+") as f:
+            f.seek(size - 1)
+            if f.read(1) == b"\n":
+                return
+            f.seek(0)
+            f.truncate(f.read().rfind(b"\n") + 1)
+        self._sizes[index] = self._file_size(index)
+
+    def _remove_segment(self, index: int) -> None:
+        try:
+            os.remove(self._segment_path(index))
+        except OSError:
+            pass
+        if index in self._segments:
+            self._segments.remove(index)
+
+    def _writer(self):
+        if self._write_handle is None:
+            self._write_handle = open(self._segment_path(self._segments[-1]), "ab")
+        return self._write_handle
+
+    def append(self, records: List[bytes]) -> None:
+        if not records:
+            return
+        handle = self._writer()
+        handle.write(b"".join(record + b"\n" for record in records))
+        handle.flush()
+        index = self._segments[-1]
+        self._sizes[index] = handle.tell()
+        if self._sizes[index] >= self.segment_bytes:
+            handle.close()
+            self._write_handle = None
+            self._segments.append(index + 1)
+            self._sizes[index + 1] = 0
+        self._enforce_limit()
+
+    def _enforce_limit(self) -> None:
+        total = sum(self._sizes.get(index, 0) for index in self._segments)
+        while total > self.max_bytes and len(self._segments) > 1:
+            index = self._segments[0]
+            start = self._read_offset if index == self._read_segment else 0
+            with open(self._segment_path(index), "rb") as f:
+                f.seek(start)
+                self.dropped_records += f.read().count(b"\n")
+            total -= self._sizes.pop(index, 0)
+            self._remove_segment(index)
+            if index >= self._read_segment:
+                self._read_segment, self._read_offset = self._segments[0], 0
+                self._save_offset()
+
+    def pending(self) -> bool:
+        if self._read_segment < self._segments[-1]:
+            return True
+        return self._read_offset < self._sizes.get(self._read_segment, 0)
+
+    def read_batch(self, max_records: int, max_bytes: int) -> Tuple[List[bytes], Tuple[int, int]]:
+        records = []
+        size = 0
+        segment, offset = self._read_segment, self._read_offset
+        while len(records) < max_records and size < max_bytes:
+            exhausted = True
+            try:
+                with open(self._segment_path(segment), "rb") as f:
+                    f.seek(offset)
+                    for line in f:
+                        if not line.endswith(b"\n"):
+                            break
+                        records.append(line[:-1])
+                        offset += len(line)
+                        size += len(line)
+                        if len(records) >= max_records or size >= max_bytes:
+                            exhausted = False
+                            break
+            except FileNotFoundError:
+                pass
+            if not exhausted or segment >= self._segments[-1]:
+                break
+            segment, offset = self._segments[self._segments.index(segment) + 1], 0
+        return records, (segment, offset)
+
+    def commit(self, position: Tuple[int, int]) -> None:
+        self._read_segment, self._read_offset = position
+        self._save_offset()
+        for index in [index for index in self._segments[:-1] if index < self._read_segment]:
+            self._sizes.pop(index, None)
+            self._remove_segment(index)
+
+    def close(self) -> None:
+        if self._write_handle is not None:
+            self._write_handle.close()
+            self._write_handle = None
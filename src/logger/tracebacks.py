@@ -0,0 +1,109 @@
+import os
+import time
+import hashlib
+import traceback
+from threading import Lock
+from types import TracebackType
+from typing import Dict, Hashable, List, Optional, Tuple
+
+
+def _frames_key(tb: Optional[TracebackType]) -> Tuple[Tuple[object, int], ...]:
+    frames = []
+    while tb is not None:
+        frames.append((tb.tb_frame.f_code, tb.tb_lineno))
+        tb = tb.tb_next
+    return tuple(frames)
+
+
+def _chain(exc: BaseException) -> List[BaseException]:
+    chain = []
+    seen = set()
+    while exc is not None and id(exc) not in seen:
+        seen.add(id(exc))
+        chain.append(exc)
+        if exc.__cause__ is not None:
+            exc = exc.__cause__
+        elif not exc.__suppress_context__:
+            exc = exc.__context__
+        else:
+            exc = None
+    return chain
+
+
+class TracebackRenderer:
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self.rendered_stacks = 0
+        self._fingerprints: Dict[Hashable, str] = {}
+        self._stacks: Dict[Hashable, str] = {}
+        self._lock = Lock()
+
+    def _remember(self, cache: Dict[Hashable, str], key: Hashable, value: str) -> None:
+        with self._lock:
+            if len(cache) >= self.max_entries:
+                cache.pop(next(iter(cache)), None)
+            cache[key] = value
+
+    def fingerprint(self, exc: BaseException) -> str:
+        key = tuple((type(item), _frames_key(item.__traceback__)) for item in _chain(exc))
+        fingerprint = self._fingerprints.get(key)
+        if fingerprint is None:
+            digest = hashlib.sha1()
+            for exc_type, frames in key:
+                digest.update(f"{exc_type.__module__}.{exc_type.__qualname__}\n".encode("utf-8"))
+                for code, lineno in frames:
+                    digest.update(f"{os.path.basename(code.co_filename)}:{code.co_name}:{lineno}\n".encode("utf-8"))
+            fingerprint = digest.hexdigest()[:12]
+            self._remember(self._fingerprints, key, fingerprint)
+        return fingerprint
+
+    def _stack(self, tb: TracebackType) -> str:
+        key = _frames_key(tb)
+        stack = self._stacks.get(key)
+        if stack is None:
+            stack = "".join(traceback.format_tb(tb))
+            self.rendered_stacks += 1
+            self._remember(self._stacks, key, stack)
+        return stack
+
+    def render(self, exc: BaseException) -> str:
+        parts = []
+        for index, item in enumerate(reversed(_chain(exc))):
+            if index:
+                parts.append(
+                    "\nThe above exception was the direct cause of the following exception:\n\n"
+                    if item.__cause__ is not None else
+                    "\nDuring handling of the above exception, another exception occurred:\n\n"
+                )
+            if item.__traceback__ is not None:
+                parts.append("Traceback (most recent call last):\n")
+                parts.append(self._stack(item.__traceback__))
+            parts.extend(traceback.format_exception_only(type(item), item))
+        return "".join(parts)
+
+
+class ExceptionTracker:
+    def __init__(self, window: float = 60.0, max_fingerprints: int = 1024):
+        self.window = window
+        self.max_fingerprints = max_fingerprints
+        self.suppressed = 0
+        self._seen: Dict[str, List[float]] = {}
+        self._lock = Lock()
+
+    def check(self, fingerprint: str, now: Optional[float] = None) -> Tuple[bool, int]:
+        if now is None:
+            now = time.monotonic()
+        with self._lock:
+            entry = self._seen.get(fingerprint)
+            if entry is None or now - entry[0] >= self.window:
+                if entry is None and len(self._seen) >= self.max_fingerprints:
+                    self._seen.pop(next(iter(self._seen)))
+                self._seen[fingerprint] = [now, 1]
+                return True, 1
+            entry[1] += 1
+            self.suppressed += 1
+            return False, int(entry[1])
+
+
+def traceback_summary(exc: BaseException) -> str:
+    return traceback.format_exception_only(type(exc), exc)[-1].strip()
@@ -0,0 +1,43 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StubNexus:
+    def __init__(self):
+        self.requests = []
+        self.attempts = 0
+        self.status = 200
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length)
+                stub.attempts += 1
+                status = stub.status
+                if status < 300:
+                    stub.requests.append(json.loads(body))
+                self.send_response(status)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/logs"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def records(self):
+        records = []
+        for body in self.requests:
+            records.extend(body if isinstance(body, list) else [body])
+        return records
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
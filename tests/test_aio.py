@@ -0,0 +1,91 @@
+import unittest
+import io
+import os
+import shutil
+import tempfile
+import threading
+import time
+from datetime import datetime
+from src.logger import AsyncLogger, AsyncAPIHandler, LogLevel
+from stub_nexus import StubNexus
+
+
+class TestAsyncLogger(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.stub = StubNexus()
+        self.output = io.StringIO()
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.stub.stop()
+        shutil.rmtree(self.temp_dir)
+
+    async def test_console_file_and_api(self):
+        logger = AsyncLogger(output=self.output, log_to_file=True, log_dir=self.temp_dir)
+        logger.enable_api_logging(service_name="async", batch_size=20, batch_linger=0.01)
+        logger.api_handler.nexus_url = self.stub.url
+
+        for i in range(50):
+            logger.info("async message {}", i, data={"i": str(i)})
+        await logger.aflush()
+
+        self.assertEqual(len(self.output.getvalue().splitlines()), 50)
+        records = self.stub.records()
+        self.assertEqual(sorted(record["message"] for record in records), sorted(f"async message {i}" for i in range(50)))
+        self.assertEqual(records[0]["service"], "async")
+        self.assertTrue(all(len(body) <= 20 for body in self.stub.requests))
+
+        await logger.aclose()
+        today = datetime.now().strftime("%Y-%m-%d")
+        with open(os.path.join(self.temp_dir, f"{today}.log")) as f:
+            self.assertEqual(len(f.read().splitlines()), 50)
+
+    async def test_logging_does_not_touch_io_on_loop(self):
+        loop_thread = threading.get_ident()
+        writer_threads = set()
+
+        class RecordingOutput(io.StringIO):
+            def write(self, text):
+                writer_threads.add(threading.get_ident())
+                return super().write(text)
+
+        logger = AsyncLogger(output=RecordingOutput())
+        logger.error("off the loop")
+        await logger.aclose()
+
+        self.assertTrue(writer_threads)
+        self.assertNotIn(loop_thread, writer_threads)
+
+    async def test_bounded_writer_queue_never_blocks_loop(self):
+        released = threading.Event()
+
+        class BlockingOutput(io.StringIO):
+            def write(self, text):
+                released.wait(5)
+                return super().write(text)
+
+        output = BlockingOutput()
+        logger = AsyncLogger(output=output, async_queue_size=2)
+        started = time.monotonic()
+        for i in range(20):
+            logger.info(f"record {i}")
+        self.assertLess(time.monotonic() - started, 0.5)
+        self.assertGreaterEqual(logger.stats()["writer_dropped"], 17)
+
+        released.set()
+        await logger.aclose()
+        self.assertEqual(len(output.getvalue().splitlines()), 20 - logger.stats()["writer_dropped"])
+
+    async def test_bounded_queue_counts_drops(self):
+        handler = AsyncAPIHandler(service_name="async", max_queue_size=2, batch_size=1)
+        handler.nexus_url = self.stub.url
+        results = [handler.send_log(LogLevel.INFO, f"m{i}") for i in range(5)]
+        await handler.aclose()
+
+        self.assertEqual(results.count(False), 3)
+        self.assertEqual(handler.dropped_counts()["newest"], 3)
+        self.assertEqual(len(self.stub.records()), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
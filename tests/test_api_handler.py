@@ -0,0 +1,217 @@
+import unittest
+import io
+import json
+import os
+import subprocess
+import sys
+import threading
+from src.logger import APIHandler, LogLevel, Logger, OverflowPolicy
+from stub_nexus import StubNexus
+
+
+class TestAPIHandler(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubNexus()
+
+    def tearDown(self):
+        self.stub.stop()
+
+    def test_single_record_mode(self):
+        handler = APIHandler(service_name="test")
+        handler.nexus_url = self.stub.url
+        handler.send_log(LogLevel.INFO, "hello", {"k": "v"})
+        handler.close()
+
+        self.assertEqual(len(self.stub.requests), 1)
+        record = self.stub.requests[0]
+        self.assertEqual(record["level"], "INFO")
+        self.assertEqual(record["service"], "test")
+        self.assertEqual(record["message"], "hello")
+        self.assertEqual(record["data"], {"k": "v"})
+
+    def test_batching_bounds_record_count(self):
+        handler = APIHandler(service_name="test", batch_size=10, batch_linger=0.5)
+        handler.nexus_url = self.stub.url
+        for i in range(25):
+            handler.send_log(LogLevel.INFO, f"message {i}")
+        handler.flush()
+
+        messages = [record["message"] for record in self.stub.records()]
+        self.assertEqual(messages, [f"message {i}" for i in range(25)])
+        self.assertTrue(all(isinstance(body, list) for body in self.stub.requests))
+        self.assertTrue(all(len(body) <= 10 for body in self.stub.requests))
+        handler.close()
+
+    def test_batching_bounds_bytes(self):
+        handler = APIHandler(service_name="test", batch_size=100, batch_max_bytes=600, batch_linger=0.5)
+        handler.nexus_url = self.stub.url
+        for i in range(20):
+            handler.send_log(LogLevel.INFO, "x" * 100)
+        handler.close()
+
+        self.assertEqual(len(self.stub.records()), 20)
+        self.assertGreater(len(self.stub.requests), 1)
+
+    def test_close_flushes_pending_records(self):
+        handler = APIHandler(service_name="test", batch_size=1000, batch_linger=60)
+        handler.nexus_url = self.stub.url
+        for i in range(5):
+            handler.send_log(LogLevel.ERROR, f"pending {i}")
+        handler.close()
+
+        self.assertEqual(len(self.stub.records()), 5)
+
+    def test_stats_report_queue_and_post_latency(self):
+        handler = APIHandler(service_name="test", batch_size=10, max_queue_size=100)
+        handler.nexus_url = self.stub.url
+        for i in range(20):
+            handler.send_log(LogLevel.INFO, f"record {i}")
+        handler.flush()
+
+        stats = handler.stats()
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["queue_capacity"], 100)
+        self.assertEqual(stats["delivery"]["sent"], 20)
+        self.assertEqual(stats["post_latency"]["count"], len(self.stub.requests))
+        self.assertEqual(stats["circuit"], "closed")
+        handler.close()
+
+
+class TestLazyStartup(unittest.TestCase):
+    def test_import_does_not_load_http_or_asyncio(self):
+        code = "import sys, src.logger; print('requests' in sys.modules, 'asyncio' in sys.modules)"
+        result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), "False False")
+
+    def test_async_mode_records_are_delivered_at_exit(self):
+        stub = StubNexus()
+        self.addCleanup(stub.stop)
+        code = (
+            "import io, sys, src.logger as l\n"
+            "log = l.Logger(output=io.StringIO(), async_mode=True, log_to_api=True)\n"
+            "log.api_handler.nexus_url = sys.argv[1]\n"
+            "for i in range(200): log.info('record %s', i)\n"
+        )
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        subprocess.run([sys.executable, "-c", code, stub.url], cwd=root, check=True, timeout=60)
+        self.assertEqual(len(stub.records()), 200)
+
+    def test_worker_starts_on_first_record(self):
+        stub = StubNexus()
+        self.addCleanup(stub.stop)
+        handler = APIHandler(service_name="test")
+        handler.nexus_url = stub.url
+        self.assertIsNone(handler._worker_thread)
+        self.assertIsNone(handler.session)
+        handler.send_log(LogLevel.INFO, "first")
+        self.assertTrue(handler._worker_thread.is_alive())
+        handler.close()
+        self.assertEqual(len(stub.requests), 1)
+
+    def test_send_after_close_is_rejected(self):
+        handler = APIHandler(service_name="test")
+        handler.close()
+        self.assertFalse(handler.send_log(LogLevel.INFO, "too late"))
+        self.assertEqual(handler.log_queue.qsize(), 0)
+        self.assertEqual(handler.dropped_counts()["closed"], 1)
+
+    def test_close_racing_send_is_counted_as_closed(self):
+        handler = APIHandler(service_name="test")
+        level_to_string = handler._level_to_string
+
+        def close_midway(level):
+            closer = threading.Thread(target=handler.close)
+            closer.start()
+            closer.join()
+            return level_to_string(level)
+
+        handler._level_to_string = close_midway
+        self.assertFalse(handler.send_log(LogLevel.INFO, "racing close"))
+        self.assertEqual(handler.log_queue.qsize(), 0)
+        self.assertEqual(handler.dropped_counts()["closed"], 1)
+
+    def test_enable_api_logging_reuses_worker(self):
+        logger = Logger(output=io.StringIO())
+        logger.enable_api_logging(service_name="first", batch_size=10)
+        handler = logger.api_handler
+        threads = threading.active_count()
+        for _ in range(5):
+            logger.enable_api_logging(service_name="second", batch_size=10)
+        self.assertIs(logger.api_handler, handler)
+        self.assertEqual(handler.service_name, "second")
+        self.assertEqual(threading.active_count(), threads)
+
+        logger.enable_api_logging(service_name="second", batch_size=20)
+        self.assertIsNot(logger.api_handler, handler)
+        self.assertTrue(handler.closed)
+        logger.close()
+
+
+class TestAPIQueueOverflow(unittest.TestCase):
+    def make_stalled_handler(self, **options):
+        handler = APIHandler(service_name="test", max_queue_size=3, **options)
+        self.gate = threading.Event()
+        self.posted = []
+
+        def stalled_post(body):
+            self.gate.wait()
+            self.posted.append(json.loads(body))
+
+        handler._post = stalled_post
+        handler.send_log(LogLevel.INFO, "in flight")
+        while handler.log_queue.qsize():
+            pass
+        return handler
+
+    def drain(self, handler):
+        self.gate.set()
+        handler.close()
+        return [record["message"] for record in self.posted[1:]]
+
+    def test_drop_newest(self):
+        handler = self.make_stalled_handler(overflow_policy=OverflowPolicy.DROP_NEWEST)
+        results = [handler.send_log(LogLevel.INFO, f"m{i}") for i in range(5)]
+
+        self.assertEqual(results, [True, True, True, False, False])
+        self.assertEqual(handler.dropped_counts()["newest"], 2)
+        self.assertEqual(self.drain(handler), ["m0", "m1", "m2"])
+
+    def test_drop_oldest(self):
+        handler = self.make_stalled_handler(overflow_policy="drop_oldest")
+        for i in range(5):
+            handler.send_log(LogLevel.INFO, f"m{i}")
+
+        self.assertEqual(handler.dropped_counts()["oldest"], 2)
+        self.assertEqual(self.drain(handler), ["m2", "m3", "m4"])
+
+    def test_block_with_timeout(self):
+        handler = self.make_stalled_handler(overflow_policy=OverflowPolicy.BLOCK, block_timeout=0.01)
+        for i in range(4):
+            handler.send_log(LogLevel.INFO, f"m{i}")
+
+        self.assertEqual(handler.dropped_counts()["timeout"], 1)
+        self.assertEqual(self.drain(handler), ["m0", "m1", "m2"])
+
+    def test_drop_below_level_keeps_errors(self):
+        handler = self.make_stalled_handler(overflow_policy=OverflowPolicy.DROP_BELOW_LEVEL, block_timeout=0.01)
+        handler.send_log(LogLevel.INFO, "info 1")
+        handler.send_log(LogLevel.ERROR, "error 1")
+        handler.send_log(LogLevel.INFO, "info 2")
+        handler.send_log(LogLevel.DEBUG, "debug")
+        handler.send_log(LogLevel.CRITICAL, "critical")
+        handler.send_log(LogLevel.ERROR, "error 2")
+
+        self.assertEqual(handler.dropped_counts()["below_level"], 3)
+        self.assertEqual(self.drain(handler), ["error 1", "critical", "error 2"])
+
+    def test_logger_exposes_drop_counts(self):
+        logger = Logger(output=io.StringIO())
+        self.assertEqual(logger.api_dropped(), {})
+        logger.enable_api_logging(service_name="test", max_queue_size=1)
+        counts = logger.api_dropped()
+        logger.disable_api_logging()
+        self.assertEqual(set(counts), {"newest", "oldest", "timeout", "below_level", "closed"})
+
+
+if __name__ == "__main__":
+    unittest.main()
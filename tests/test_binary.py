@@ -0,0 +1,117 @@
+import unittest
+import io
+import os
+import json
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from src.logger import FileHandler, Formatter, Logger, LogLevel
+from src.logger.binary import MAGIC, BinaryEncoder, BinaryRecord, decode, main, read_file
+from src.logger.query import query
+
+
+class Order:
+    def __str__(self):
+        return "order#7"
+
+
+class TestBinaryFormat(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.output = io.StringIO()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def log_path(self, log_dir):
+        return os.path.join(log_dir, os.listdir(log_dir)[0])
+
+    def write_logs(self, file_format, count=200):
+        log_dir = os.path.join(self.temp_dir, file_format)
+        logger = Logger(output=self.output, min_level=LogLevel.DEBUG, service_name="bench")
+        logger.enable_file_logging(log_dir=log_dir, file_format=file_format)
+        for i in range(count):
+            logger.info("order %s filled at %s", i, 101.25 + i)
+            logger.debug("user {} logged in", f"user-{i}")
+        logger.error("payment failed", data={"order": "42", "retry": "no"})
+        logger.warning(lambda: "lazy warning")
+        logger.notice("object %s", Order())
+        logger.close()
+        return self.log_path(log_dir)
+
+    def test_round_trip_through_logger(self):
+        path = self.write_logs("binary", count=3)
+        records = list(read_file(path))
+        self.assertEqual([record.message for record in records[:2]], ["order 0 filled at 101.25", "user user-0 logged in"])
+        self.assertEqual(records[1].level, LogLevel.DEBUG)
+        self.assertEqual(records[-3].data, {"order": "42", "retry": "no"})
+        self.assertEqual(records[-2].message, "lazy warning")
+        self.assertEqual(records[-1].message, "object order#7")
+        self.assertEqual({record.service for record in records}, {"bench"})
+
+    def test_binary_is_several_times_smaller_than_plain(self):
+        plain_size = os.path.getsize(self.write_logs("plain"))
+        binary_size = os.path.getsize(self.write_logs("binary"))
+        self.assertLess(binary_size * 2.5, plain_size)
+
+    def test_templates_are_stored_once_per_file(self):
+        encoder = BinaryEncoder(service="svc")
+        data = encoder.header()
+        data += encoder.encode(LogLevel.INFO, BinaryRecord(1700000000.0, "tick %s", (1,), None))
+        second = encoder.encode(LogLevel.INFO, BinaryRecord(1700000000.5, "tick %s", (2,), None))
+        self.assertNotIn(b"tick", second)
+        data += second
+        self.assertEqual([record.message for record in decode(data)], ["tick 1", "tick 2"])
+        usage = encoder.encode(LogLevel.INFO, BinaryRecord(1700000001.0, "CPU at {:.1f}%", (12.34,), None))
+        self.assertEqual(list(decode(encoder.header() + usage))[0].message, "CPU at 12.3%")
+        self.assertEqual([record.timestamp for record in decode(data)], [1700000000.0, 1700000000.5])
+
+    def test_reopen_and_truncated_tail(self):
+        handler = FileHandler(log_dir=self.temp_dir, file_format="binary")
+        handler.setup()
+        handler.write_record(LogLevel.INFO, BinaryRecord(1700000000.0, "first %s", (1,), None))
+        handler.close()
+        with open(handler.log_file_path, "ab") as f:
+            f.write(b"\x02\x80")
+
+        handler = FileHandler(log_dir=self.temp_dir, file_format="binary")
+        handler.setup()
+        handler.write_record(LogLevel.ERROR, BinaryRecord(1700000001.0, "first %s", (2,), None))
+        handler.close()
+
+        with open(handler.log_file_path, "rb") as f:
+            self.assertEqual(f.read().count(MAGIC), 2)
+        self.assertEqual([record.message for record in read_file(handler.log_file_path)], ["first 1", "first 2"])
+
+    def test_binary_cannot_be_shared_between_processes(self):
+        with self.assertRaises(ValueError):
+            FileHandler(log_dir=self.temp_dir, file_format="binary", multiprocess=True)
+
+    def test_decoder_cli_matches_text_formats(self):
+        handler = FileHandler(log_dir=self.temp_dir, file_format="binary", service_name="svc")
+        handler.setup()
+        handler.write_record(LogLevel.WARNING, BinaryRecord(1700000000.0, "disk at %d%%", (93,), {"mount": "/"}))
+        handler.close()
+        formatter = Formatter()
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main([handler.log_file_path])
+        self.assertEqual(output.getvalue(), formatter.format_plain(LogLevel.WARNING, "disk at 93%", 1700000000.0) + "\n")
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main([handler.log_file_path, "--json"])
+        record = json.loads(output.getvalue())
+        self.assertEqual(record["message"], "disk at 93%")
+        self.assertEqual(record["service"], "svc")
+        self.assertEqual(record["data"], {"mount": "/"})
+
+    def test_query_reads_binary_files(self):
+        self.write_logs("binary", count=5)
+        records = list(query(os.path.join(self.temp_dir, "binary"), min_level=LogLevel.ERROR))
+        self.assertEqual([record.message for record in records], ["payment failed"])
+
+
+if __name__ == '__main__':
+    unittest.main()
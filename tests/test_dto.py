@@ -0,0 +1,42 @@
+import unittest
+import re
+import time
+import uuid
+from src.logger import LogDTO
+
+
+class TestLogDTO(unittest.TestCase):
+    def test_wire_format(self):
+        created = time.mktime((2024, 5, 17, 13, 45, 30, 0, 0, -1))
+        dto = LogDTO(level="INFO", service="qtb", message="hello", data={"k": "v"}, created=created)
+        record = dto.to_dict()
+
+        self.assertEqual(list(record), ["level", "service", "message", "data", "id", "date"])
+        self.assertEqual(record["level"], "INFO")
+        self.assertEqual(record["data"], {"k": "v"})
+        self.assertEqual(record["date"], time.strftime("%Y-%m-%d %H:%M:%S", time.gmtime(created)))
+        self.assertEqual(uuid.UUID(record["id"]).version, 7)
+        self.assertTrue(re.match(r"^[0-9a-f]{8}-[0-9a-f]{4}-7[0-9a-f]{3}-[89ab][0-9a-f]{3}-[0-9a-f]{12}$", record["id"]))
+
+    def test_defaults_and_explicit_values(self):
+        dto = LogDTO(level="ERROR", service="qtb", message="boom")
+        self.assertEqual(dto.data, {})
+
+        explicit = LogDTO(level="ERROR", service="qtb", message="boom", id="fixed", date="2024-01-01 00:00:00")
+        self.assertEqual(explicit.id, "fixed")
+        self.assertEqual(explicit.date, "2024-01-01 00:00:00")
+        self.assertEqual(explicit, LogDTO(level="ERROR", service="qtb", message="boom", id="fixed", date="2024-01-01 00:00:00"))
+
+    def test_ids_are_unique_and_time_ordered(self):
+        ids = [LogDTO(level="INFO", service="qtb", message="m", created=1700000000 + i).id for i in range(1000)]
+        self.assertEqual(len(set(ids)), 1000)
+        self.assertEqual([i[:13] for i in ids], sorted(i[:13] for i in ids))
+
+    def test_slots(self):
+        dto = LogDTO(level="INFO", service="qtb", message="m")
+        with self.assertRaises(AttributeError):
+            dto.extra = 1
+
+
+if __name__ == "__main__":
+    unittest.main()
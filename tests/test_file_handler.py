@@ -0,0 +1,251 @@
+import unittest
+import os
+import re
+import gzip
+import multiprocessing
+import time
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from unittest import mock
+from src.logger import FileHandler, LogLevel
+
+
+class TestBufferedFileHandler(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_file_path = os.path.join(self.temp_dir, f"{datetime.now().strftime('%Y-%m-%d')}.log")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def read_log(self):
+        with open(self.log_file_path, "r") as f:
+            return f.read()
+
+    def make_handler(self, **options):
+        handler = FileHandler(log_dir=self.temp_dir, buffered=True, **options)
+        handler.setup()
+        self.addCleanup(handler.close)
+        return handler
+
+    def test_unbuffered_writes_every_line(self):
+        handler = FileHandler(log_dir=self.temp_dir)
+        handler.setup()
+        handler.write("first line")
+        self.assertEqual(self.read_log(), "first line\n")
+        handler.close()
+
+    def test_flush_every_n_records(self):
+        handler = self.make_handler(flush_every=3)
+        handler.write("line 1")
+        handler.write("line 2")
+        self.assertEqual(self.read_log(), "")
+
+        handler.write("line 3")
+        self.assertEqual(self.read_log(), "line 1\nline 2\nline 3\n")
+
+    def test_flush_level(self):
+        handler = self.make_handler(flush_every=100, flush_level=LogLevel.ERROR)
+        handler.write("info line", LogLevel.INFO)
+        self.assertEqual(self.read_log(), "")
+
+        handler.write("error line", LogLevel.ERROR)
+        self.assertEqual(self.read_log(), "info line\nerror line\n")
+
+    def test_flush_interval(self):
+        handler = self.make_handler(flush_every=100, flush_interval_ms=20, fsync=True)
+        handler.write("idle line")
+
+        deadline = time.monotonic() + 2
+        while not self.read_log() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.read_log(), "idle line\n")
+
+    def test_default_policy_only_flushes_on_chosen_triggers(self):
+        handler = self.make_handler(flush_interval_ms=200)
+        for i in range(100):
+            handler.write(f"line {i}")
+        self.assertEqual(self.read_log(), "")
+
+        deadline = time.monotonic() + 2
+        while not self.read_log() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.read_log().count("\n"), 100)
+
+    def test_fsync_only_on_flush(self):
+        handler = self.make_handler(fsync=True)
+        with mock.patch("src.logger.file_handler.os.fsync") as fsync:
+            for i in range(100):
+                handler.write(f"line {i}")
+            self.assertEqual(fsync.call_count, 0)
+            handler.flush()
+            self.assertEqual(fsync.call_count, 1)
+
+    def test_close_flushes(self):
+        handler = self.make_handler(flush_every=100)
+        handler.write("buffered line")
+        handler.close()
+        self.assertEqual(self.read_log(), "buffered line\n")
+
+    def test_day_rotation_flushes_previous_file(self):
+        handler = self.make_handler(flush_every=100)
+        handler.write("before rotation")
+        previous_handle = handler.file_handle
+
+        handler._log_date = "2000-01-01"
+        handler._rollover_at = 0.0
+        handler.write("after rotation")
+
+        self.assertTrue(previous_handle.closed)
+        self.assertIsNot(handler.file_handle, previous_handle)
+        self.assertEqual(self.read_log(), "before rotation\n")
+
+
+
+class TestFileRotation(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.today = datetime.now().strftime("%Y-%m-%d")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_old_file(self, days_ago, size=10):
+        date = (datetime.now() - timedelta(days=days_ago)).strftime("%Y-%m-%d")
+        path = os.path.join(self.temp_dir, f"{date}.log")
+        with open(path, "w") as f:
+            f.write("x" * size)
+        return path
+
+    def test_size_rotation_compresses_segments(self):
+        handler = FileHandler(log_dir=self.temp_dir, max_bytes=100, compress=True)
+        handler.setup()
+        lines = [f"line {i:03d} " + "y" * 20 for i in range(20)]
+        for line in lines:
+            handler.write(line)
+        handler.close()
+
+        names = sorted(os.listdir(self.temp_dir))
+        segments = [name for name in names if name.endswith(".log.gz")]
+        self.assertGreater(len(segments), 1)
+        self.assertFalse([name for name in names if name.endswith(".tmp")])
+        self.assertEqual(segments[0], f"{self.today}.1.log.gz")
+
+        content = ""
+        for index in range(1, len(segments) + 1):
+            with gzip.open(os.path.join(self.temp_dir, f"{self.today}.{index}.log.gz"), "rt") as f:
+                content += f.read()
+        active_path = os.path.join(self.temp_dir, f"{self.today}.log")
+        if os.path.exists(active_path):
+            with open(active_path) as f:
+                content += f.read()
+        self.assertEqual(content.splitlines(), lines)
+
+    def test_size_rotation_counts_encoded_bytes(self):
+        for multiprocess in (False, True):
+            log_dir = os.path.join(self.temp_dir, str(multiprocess))
+            handler = FileHandler(log_dir=log_dir, max_bytes=100, multiprocess=multiprocess)
+            handler.setup()
+            for _ in range(4):
+                handler.write("é" * 30)
+            handler.close()
+
+            with open(os.path.join(log_dir, f"{self.today}.1.log"), "rb") as f:
+                self.assertEqual(f.read(), ("é" * 30 + "\n").encode("utf-8") * 2)
+
+    def test_segment_numbering_continues_after_restart(self):
+        for _ in range(2):
+            handler = FileHandler(log_dir=self.temp_dir, max_bytes=10)
+            handler.setup()
+            handler.write("long enough line")
+            handler.close()
+
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, f"{self.today}.1.log")))
+        self.assertTrue(os.path.exists(os.path.join(self.temp_dir, f"{self.today}.2.log")))
+
+    def test_retention_by_age(self):
+        old_path = self.write_old_file(days_ago=30)
+        recent_path = self.write_old_file(days_ago=2)
+
+        handler = FileHandler(log_dir=self.temp_dir, retention_days=7)
+        handler.setup()
+        handler.write("today")
+        handler.archiver.wait()
+        handler.close()
+
+        self.assertFalse(os.path.exists(old_path))
+        self.assertTrue(os.path.exists(recent_path))
+
+    def test_retention_by_total_size(self):
+        oldest_path = self.write_old_file(days_ago=3, size=400)
+        older_path = self.write_old_file(days_ago=2, size=400)
+        newer_path = self.write_old_file(days_ago=1, size=400)
+
+        handler = FileHandler(log_dir=self.temp_dir, max_total_bytes=1000)
+        handler.setup()
+        handler.archiver.wait()
+        handler.close()
+
+        self.assertFalse(os.path.exists(oldest_path))
+        self.assertTrue(os.path.exists(older_path))
+        self.assertTrue(os.path.exists(newer_path))
+
+
+
+def write_from_worker(log_dir, worker, count):
+    handler = FileHandler(log_dir=log_dir, multiprocess=True, buffered=True, flush_every=7,
+                          max_bytes=20000, reopen_check_interval=0.0)
+    handler.setup()
+    for i in range(count):
+        handler.write(f"worker={worker} seq={i} " + "z" * (i % 50))
+    handler.close()
+
+
+@unittest.skipUnless("fork" in multiprocessing.get_all_start_methods(), "requires fork")
+class TestMultiprocessFileHandler(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def test_concurrent_workers_do_not_tear_lines(self):
+        context = multiprocessing.get_context("fork")
+        workers = [context.Process(target=write_from_worker, args=(self.temp_dir, worker, 400)) for worker in range(6)]
+        for process in workers:
+            process.start()
+        for process in workers:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+
+        lines = []
+        names = [name for name in os.listdir(self.temp_dir) if name.endswith(".log")]
+        self.assertGreater(len(names), 1)
+        for name in names:
+            with open(os.path.join(self.temp_dir, name)) as f:
+                lines.extend(f.read().splitlines())
+
+        pattern = re.compile(r"^worker=(\d) seq=(\d+) z*$")
+        seen = set()
+        for line in lines:
+            match = pattern.match(line)
+            self.assertIsNotNone(match, line)
+            seen.add(match.groups())
+        self.assertEqual(len(lines), 6 * 400)
+        self.assertEqual(len(seen), 6 * 400)
+
+    def test_oversized_records_are_truncated_to_one_write(self):
+        handler = FileHandler(log_dir=self.temp_dir, multiprocess=True, max_record_bytes=64)
+        handler.setup()
+        handler.write("x" * 500)
+        handler.close()
+
+        with open(handler.log_file_path, "rb") as f:
+            content = f.read()
+        self.assertEqual(len(content), 64)
+        self.assertTrue(content.endswith(b"...[truncated]\n"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import unittest
+import time
+from src.logger import Formatter, LogLevel, Colors
+
+
+class TestFormatter(unittest.TestCase):
+    def setUp(self):
+        self.timestamp = time.mktime((2024, 5, 17, 13, 45, 30, 0, 0, -1)) + 0.123456
+
+    def test_plain_and_colored_layout(self):
+        formatter = Formatter()
+
+        self.assertEqual(
+            formatter.format_plain(LogLevel.WARNING, "message", self.timestamp),
+            "2024-05-17 13:45:30 [WARNING ] message"
+        )
+        self.assertEqual(
+            formatter.format_colored(LogLevel.ERROR, "message", self.timestamp),
+            f"{Colors.RED}2024-05-17 13:45:30{Colors.RESET} [{Colors.RED}ERROR   {Colors.RESET}] message"
+        )
+
+    def test_format_both_matches_individual_formats(self):
+        formatter = Formatter()
+        colored, plain = formatter.format_both(LogLevel.INFO, "message", self.timestamp)
+
+        self.assertEqual(colored, formatter.format_colored(LogLevel.INFO, "message", self.timestamp))
+        self.assertEqual(plain, formatter.format_plain(LogLevel.INFO, "message", self.timestamp))
+
+    def test_timestamp_cache_follows_the_second(self):
+        formatter = Formatter()
+
+        self.assertEqual(formatter.format_timestamp(self.timestamp), "2024-05-17 13:45:30")
+        self.assertEqual(formatter.format_timestamp(self.timestamp + 0.5), "2024-05-17 13:45:30")
+        self.assertEqual(formatter.format_timestamp(self.timestamp + 1), "2024-05-17 13:45:31")
+
+    def test_sub_second_precision(self):
+        self.assertEqual(Formatter(precision="ms").format_timestamp(self.timestamp), "2024-05-17 13:45:30.123")
+        self.assertEqual(Formatter(precision="us").format_timestamp(self.timestamp)[:-1], "2024-05-17 13:45:30.12345")
+        with self.assertRaises(ValueError):
+            Formatter(precision="ns")
+
+    def test_unknown_level(self):
+        self.assertTrue(Formatter().format_plain(42, "message").endswith(" [UNKNOWN ] message"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,15 @@
 import unittest
 import io
+import json
 import re
 import os
 import shutil
 import tempfile
+import threading
+import time
 from datetime import datetime
-from src.logger import Logger, LogLevel
+from src.logger import Logger, LogLevel, Sink, StreamSink
+from src.logger.filters import RateLimiter
 
 
 class TestLogger(unittest.TestCase):
@@ -148,5 +152,532 @@ class TestLogger(unittest.TestCase):
             self.assertNotIn("INFO", content)
 
 
+    def test_async_mode_writes_after_flush(self):
+        log_dir = os.path.join(self.temp_dir, "async_logs")
+        async_logger = Logger(output=self.output, min_level=LogLevel.INFO,
+                              log_to_file=True, log_dir=log_dir, async_mode=True)
+
+        for i in range(100):
+            async_logger.info(f"Async message {i}")
+        async_logger.flush()
+
+        lines = self.output.getvalue().splitlines()
+        self.assertEqual(len(lines), 100)
+        self.assertIn("Async message 0", lines[0])
+        self.assertIn("Async message 99", lines[-1])
+
+        async_logger.close()
+        today = datetime.now().strftime("%Y-%m-%d")
+        with open(os.path.join(log_dir, f"{today}.log"), "r") as f:
+            self.assertEqual(len(f.read().splitlines()), 100)
+
+    def test_async_mode_does_not_block_caller(self):
+        release = threading.Event()
+
+        class SlowOutput(io.StringIO):
+            def write(self, text):
+                release.wait()
+                return super().write(text)
+
+        slow_output = SlowOutput()
+        async_logger = Logger(output=slow_output, async_mode=True)
+
+        started = time.monotonic()
+        async_logger.error("Stalled write")
+        self.assertLess(time.monotonic() - started, 0.5)
+
+        release.set()
+        async_logger.close()
+        self.assertIn("Stalled write", slow_output.getvalue())
+
+
+    def test_lazy_arguments_not_evaluated_below_min_level(self):
+        self.logger.min_level = LogLevel.INFO
+        calls = []
+
+        def expensive():
+            calls.append(1)
+            return "expensive"
+
+        self.logger.debug("Value %s", expensive)
+        self.logger.debug(expensive)
+        self.assertEqual(calls, [])
+        self.assertFalse(self.logger.is_enabled(LogLevel.DEBUG))
+        self.assertTrue(self.logger.is_enabled(LogLevel.INFO))
+
+        self.logger.info("Value %s", expensive)
+        self.logger.info(expensive)
+        self.assertEqual(len(calls), 2)
+        self.assertIn("Value expensive", self.output.getvalue())
+
+    def test_message_arguments(self):
+        self.logger.info("Printf %s=%d", "count", 3)
+        self.logger.info("Format {}={}", "count", 4)
+        self.logger.info("Literal 100%")
+        self.logger.info("CPU at {:.1f}%", 12.34)
+        self.logger.info("Disk at %d%%", 93)
+
+        output = self.output.getvalue()
+        self.assertIn("Printf count=3", output)
+        self.assertIn("Format count=4", output)
+        self.assertIn("Literal 100%", output)
+        self.assertIn("CPU at 12.3%", output)
+        self.assertIn("Disk at 93%", output)
+
+    def test_positional_data_dict_still_reaches_api(self):
+        sent = []
+
+        class RecordingAPIHandler:
+            def send_log(self, level, message, data=None, timestamp=None):
+                sent.append((level, message, data))
+
+        self.logger.log_to_api = True
+        self.logger.api_handler = RecordingAPIHandler()
+        self.logger.info("Positional", {"pair": "BTC/USDT"})
+        self.logger.info("Keyword %s", "args", data={"pair": "ETH/USDT"})
+        self.logger.info("Dict arg %s", {"a": 1})
+        self.logger.info("Dict arg {}", {"b": 2})
+        self.logger.info("Discount 100%", {"pair": "SOL/USDT"})
+        self.logger.api_handler = None
+
+        self.assertEqual(sent, [
+            (LogLevel.INFO, "Positional", {"pair": "BTC/USDT"}),
+            (LogLevel.INFO, "Keyword args", {"pair": "ETH/USDT"}),
+            (LogLevel.INFO, "Dict arg {'a': 1}", None),
+            (LogLevel.INFO, "Dict arg {'b': 2}", None),
+            (LogLevel.INFO, "Discount 100%", {"pair": "SOL/USDT"}),
+        ])
+
+    def test_dict_argument_rule_shared_by_replay_and_exceptions(self):
+        self.logger.min_level = LogLevel.INFO
+        self.logger.enable_flight_recorder(capacity=10, min_level=LogLevel.DEBUG, trigger_level=None)
+        self.logger.debug("replayed %s", {"a": 1})
+        self.logger.dump_flight_recorder()
+        try:
+            raise KeyError("k")
+        except KeyError:
+            self.logger.exception("failed for %s", {"b": 2})
+        output = self.output.getvalue()
+        self.assertIn("replayed {'a': 1}", output)
+        self.assertIn("failed for {'b': 2}", output)
+
+    def test_bound_context_is_read_only(self):
+        bound = self.logger.bind(request_id="r-1")
+        for mutate in (
+            lambda context: context.__setitem__("k", "v"),
+            lambda context: context.update(k="v"),
+            lambda context: context.pop("request_id"),
+            lambda context: context.setdefault("k", "v"),
+            lambda context: context.clear(),
+        ):
+            with self.assertRaises(TypeError):
+                mutate(bound.context)
+        self.assertEqual(bound.context, {"request_id": "r-1"})
+        bound.info("still bound")
+        self.assertTrue(self.output.getvalue().rstrip().endswith("still bound request_id=r-1"))
+
+    def test_bound_logger_context(self):
+        sent = []
+
+        class RecordingAPIHandler:
+            def send_log(self, level, message, data=None, timestamp=None):
+                sent.append((level, message, data))
+
+            def close(self):
+                pass
+
+        log_dir = os.path.join(self.temp_dir, "bound")
+        self.logger.enable_file_logging(log_dir=log_dir, file_format="json")
+        self.logger.api_handler = RecordingAPIHandler()
+        bound = self.logger.bind(request_id="r-1", pair="BTC/USDT")
+        bound.info("Order %s placed", 7)
+        bound.bind(strategy="grid").warning("Extra", data={"price": "101"})
+        bound.info("Positional", {"price": "99"})
+        self.logger.info("Unbound")
+        self.logger.disable_file_logging()
+
+        lines = self.output.getvalue().splitlines()
+        self.assertTrue(lines[0].endswith("Order 7 placed request_id=r-1 pair=BTC/USDT"))
+        self.assertTrue(lines[1].endswith("Extra request_id=r-1 pair=BTC/USDT strategy=grid"))
+        self.assertTrue(lines[3].endswith("Unbound"))
+
+        with open(os.path.join(log_dir, os.listdir(log_dir)[0])) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(records[0]["message"], "Order 7 placed")
+        self.assertEqual(records[0]["data"], {"request_id": "r-1", "pair": "BTC/USDT"})
+        self.assertEqual(records[1]["data"], {"request_id": "r-1", "pair": "BTC/USDT", "strategy": "grid", "price": "101"})
+        self.assertEqual(records[2]["data"], {"request_id": "r-1", "pair": "BTC/USDT", "price": "99"})
+        self.assertEqual(records[3]["data"], {})
+
+        self.assertEqual(sent[0], (LogLevel.INFO, "Order 7 placed", {"request_id": "r-1", "pair": "BTC/USDT"}))
+        self.assertEqual(dict(bound.context), {"request_id": "r-1", "pair": "BTC/USDT"})
+        self.logger.api_handler = None
+
+    def test_bound_logger_respects_levels(self):
+        self.logger.min_level = LogLevel.INFO
+        bound = self.logger.bind(job="sync")
+        self.assertFalse(bound.is_enabled(LogLevel.DEBUG))
+        bound.debug("Hidden")
+        self.assertEqual(self.output.getvalue(), "")
+        bound.flush()
+
+    def test_json_lines_file_format(self):
+        log_dir = os.path.join(self.temp_dir, "json_logs")
+        json_logger = Logger(output=self.output, min_level=LogLevel.INFO, log_to_file=True,
+                             log_dir=log_dir, service_name="strategy", file_format="json")
+
+        json_logger.warning("Quote \"filled\"\n", data={"pair": "BTC/USDT", "qty": 2})
+        json_logger.info("Plain message")
+        json_logger.close()
+
+        today = datetime.now().strftime("%Y-%m-%d")
+        with open(os.path.join(log_dir, f"{today}.log"), "r") as f:
+            records = [json.loads(line) for line in f]
+
+        self.assertEqual(len(records), 2)
+        self.assertEqual(records[0]["level"], "WARNING")
+        self.assertEqual(records[0]["service"], "strategy")
+        self.assertEqual(records[0]["message"], "Quote \"filled\"\n")
+        self.assertEqual(records[0]["data"], {"pair": "BTC/USDT", "qty": 2})
+        self.assertEqual(records[1]["data"], {})
+        self.assertTrue(re.match(r"\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}$", records[1]["timestamp"]))
+        self.assertIn("Plain message", self.output.getvalue())
+
+
+    def test_duplicate_suppression(self):
+        self.logger.enable_duplicate_suppression(summary_interval=60)
+        for _ in range(1000):
+            self.logger.error("Connection refused")
+        self.logger.info("Recovered")
+        self.logger.error("Connection refused")
+        self.logger.flush()
+
+        lines = self.output.getvalue().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertIn("Connection refused", lines[0])
+        self.assertIn("Previous message repeated 999 times", lines[1])
+        self.assertIn("ERROR", lines[1])
+        self.assertIn("Recovered", lines[2])
+        self.assertEqual(self.logger.suppression_counts()["duplicates"], 999)
+
+    def test_rate_limit_per_template(self):
+        self.logger.enable_rate_limit(rate=0.0001, burst=3)
+        for i in range(100):
+            self.logger.warning("Order %d rejected", i)
+        self.logger.warning("Other template")
+
+        output = self.output.getvalue()
+        self.assertIn("Order 2 rejected", output)
+        self.assertNotIn("Order 3 rejected", output)
+        self.assertIn("Other template", output)
+        self.assertEqual(self.logger.suppression_counts()["rate_limited"], 97)
+
+    def test_rate_limit_key_overflow_keeps_storming_bucket(self):
+        limiter = RateLimiter(rate=0.0001, burst=2, max_keys=3)
+        allowed = 0
+        for i in range(50):
+            allowed += limiter.acquire("storm", now=float(i))[0]
+            limiter.acquire(f"unique {i}", now=float(i))
+        self.assertEqual(allowed, 2)
+        self.assertLessEqual(len(limiter._buckets), 3)
+
+    def test_rate_limit_per_call_site(self):
+        self.logger.enable_rate_limit(rate=0.0001, burst=2, by_call_site=True)
+        for i in range(10):
+            self.logger.info(f"Site A {i}")
+            self.logger.info(f"Site B {i}")
+
+        output = self.output.getvalue()
+        self.assertEqual(output.count("Site A"), 2)
+        self.assertEqual(output.count("Site B"), 2)
+
+    def test_sampling_per_level(self):
+        self.logger.enable_sampling({LogLevel.DEBUG: 0.0, LogLevel.INFO: 0.5})
+        for i in range(1000):
+            self.logger.debug("Sampled debug")
+            self.logger.info("Sampled info")
+        self.logger.error("Never sampled")
+
+        output = self.output.getvalue()
+        self.assertNotIn("Sampled debug", output)
+        self.assertTrue(300 < output.count("Sampled info") < 700)
+        self.assertIn("Never sampled", output)
+        self.logger.disable_suppression()
+        self.assertEqual(self.logger.suppression_counts(), {"duplicates": 0, "rate_limited": 0, "sampled_out": 0})
+
+    def test_stats_counts_records_and_sink_writes(self):
+        self.logger.enable_file_logging(log_dir=self.temp_dir)
+        self.logger.info("first")
+        self.logger.info("second")
+        self.logger.error("third")
+
+        stats = self.logger.stats()
+        self.assertEqual(stats["records"]["INFO"], 2)
+        self.assertEqual(stats["records"]["ERROR"], 1)
+        self.assertEqual(stats["records"]["DEBUG"], 0)
+        self.assertEqual(stats["sinks"]["console"]["writes"], 3)
+        self.assertEqual(stats["sinks"]["file"]["writes"], 3)
+        latency = stats["sinks"]["file"]["write_latency"]
+        self.assertEqual(latency["count"], 3)
+        self.assertEqual(latency["buckets"][-1][1], 3)
+        self.assertIsNotNone(latency["p99"])
+        self.assertNotIn("api", stats["sinks"])
+        self.logger.disable_file_logging()
+
+    def test_stats_aggregate_producer_threads(self):
+        def produce():
+            for i in range(500):
+                self.logger.debug("worker %s", i)
+
+        workers = [threading.Thread(target=produce) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(self.logger.stats()["records"]["DEBUG"], 2000)
+
+        self.logger.disable_metrics()
+        self.logger.debug("not counted")
+        self.assertEqual(self.logger.stats()["records"]["DEBUG"], 0)
+
+    def test_finished_thread_shards_are_folded(self):
+        metrics = self.logger.metrics
+        for batch in range(20):
+            workers = [threading.Thread(target=self.logger.info, args=("short-lived %s", i)) for i in range(10)]
+            for worker in workers:
+                worker.start()
+            for worker in workers:
+                worker.join()
+            metrics.observe("latency", 0.001)
+        self.assertEqual(self.logger.stats()["records"]["INFO"], 200)
+        self.assertEqual(metrics.histogram("latency")["count"], 20)
+        self.assertLessEqual(len(metrics._shards), 2)
+
+    def test_prometheus_textfile_export(self):
+        path = os.path.join(self.temp_dir, "logger.prom")
+        self.logger.enable_metrics_export(path, interval=0.05)
+        self.logger.warning("exported")
+        time.sleep(0.2)
+        with open(path) as f:
+            text = f.read()
+        self.assertIn('# TYPE logger_records_total counter', text)
+        self.assertIn('logger_records_total{service="qtb",level="WARNING"} 1', text)
+        self.assertIn('logger_sink_write_seconds_bucket{service="qtb",sink="console",le="+Inf"} 1', text)
+        self.logger.close()
+        self.assertFalse([name for name in os.listdir(self.temp_dir) if name.endswith(".tmp")])
+
+    def test_per_sink_levels(self):
+        log_dir = os.path.join(self.temp_dir, "sinks")
+        self.logger.min_level = LogLevel.DEBUG
+        self.logger.set_sink_level("console", LogLevel.ERROR)
+        self.logger.enable_file_logging(log_dir=log_dir, level=LogLevel.DEBUG)
+        self.logger.trace("Dropped everywhere")
+        self.logger.debug("File only")
+        self.logger.error("Both sinks")
+        self.logger.disable_file_logging()
+
+        console = self.output.getvalue()
+        self.assertNotIn("File only", console)
+        self.assertIn("Both sinks", console)
+        with open(os.path.join(log_dir, os.listdir(log_dir)[0])) as f:
+            file_content = f.read()
+        self.assertIn("File only", file_content)
+        self.assertIn("Both sinks", file_content)
+        self.assertNotIn("Dropped everywhere", file_content)
+
+    def test_minimum_sink_level_rejects_early(self):
+        self.logger.set_sink_level("console", LogLevel.WARNING)
+        self.assertFalse(self.logger.is_enabled(LogLevel.INFO))
+        calls = []
+        self.logger.info(lambda: calls.append(1) or "lazy")
+        self.assertEqual(calls, [])
+
+        self.logger.add_sink("debug", StreamSink(io.StringIO(), level=LogLevel.DEBUG, format="plain"))
+        self.assertTrue(self.logger.is_enabled(LogLevel.DEBUG))
+        self.logger.remove_sink("debug")
+        self.assertFalse(self.logger.is_enabled(LogLevel.DEBUG))
+
+    def test_each_format_rendered_once_per_record(self):
+        class CollectingSink(Sink):
+            def __init__(self, format):
+                super().__init__(format=format)
+                self.messages = []
+
+            def emit(self, level, message):
+                self.messages.append(message)
+
+        sinks = [CollectingSink("plain"), CollectingSink("plain"), CollectingSink("json")]
+        for index, sink in enumerate(sinks):
+            self.logger.add_sink(f"collect{index}", sink)
+
+        calls = {"both": 0, "json": 0}
+        format_both, format_json = self.logger.formatter.format_both, self.logger.formatter.format_json
+
+        def counting_both(*args):
+            calls["both"] += 1
+            return format_both(*args)
+
+        def counting_json(*args):
+            calls["json"] += 1
+            return format_json(*args)
+
+        self.logger.formatter.format_both = counting_both
+        self.logger.formatter.format_json = counting_json
+        self.logger.info("Shared")
+
+        self.assertEqual(calls, {"both": 1, "json": 1})
+        self.assertIs(sinks[0].messages[0], sinks[1].messages[0])
+        self.assertEqual(json.loads(sinks[2].messages[0])["message"], "Shared")
+        self.assertIn("Shared", self.output.getvalue())
+
+    def test_flight_recorder_dumps_on_error(self):
+        self.logger.min_level = LogLevel.INFO
+        self.logger.enable_flight_recorder(capacity=3)
+        calls = []
+        for i in range(5):
+            self.logger.debug("Step %s", i)
+        self.logger.trace(lambda: calls.append(1) or "Lazy trace")
+        self.logger.info("Visible")
+        self.assertEqual(calls, [])
+        self.assertNotIn("Step", self.output.getvalue())
+
+        self.logger.error("Failure")
+        lines = self.output.getvalue().splitlines()
+        self.assertIn("Visible", lines[0])
+        self.assertIn("Flight recorder: replaying 3 buffered records", lines[1])
+        self.assertIn("DEBUG", lines[2])
+        self.assertTrue(lines[2].endswith("Step 3"))
+        self.assertTrue(lines[3].endswith("Step 4"))
+        self.assertIn("TRACE", lines[4])
+        self.assertTrue(lines[4].endswith("Lazy trace"))
+        self.assertIn("Failure", lines[5])
+        self.assertEqual(calls, [1])
+
+        self.logger.error("Second failure")
+        self.assertEqual(len(self.output.getvalue().splitlines()), 7)
+
+    def test_flight_recorder_replay_bypasses_sink_levels(self):
+        self.logger.set_sink_level("console", LogLevel.INFO)
+        self.logger.enable_flight_recorder(capacity=10, min_level=LogLevel.DEBUG)
+        self.logger.min_level = LogLevel.DEBUG
+        self.logger.debug("debug context")
+        self.logger.trace("trace context")
+        self.assertEqual(self.output.getvalue(), "")
+
+        self.logger.error("boom")
+        lines = self.output.getvalue().splitlines()
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[0].endswith("Flight recorder: replaying 1 buffered records"))
+        self.assertTrue(lines[1].endswith("debug context"))
+        self.assertTrue(lines[2].endswith("boom"))
+
+    def test_flight_recorder_on_demand(self):
+        self.logger.min_level = LogLevel.WARNING
+        self.logger.enable_flight_recorder(capacity=10, min_level=LogLevel.DEBUG, trigger_level=None)
+        self.logger.trace("Too verbose")
+        self.logger.info("Kept", {"pair": "BTC/USDT"})
+        self.logger.bind(job="sync").debug("Bound")
+        self.logger.error("No automatic dump")
+        self.assertEqual(len(self.output.getvalue().splitlines()), 1)
+
+        self.assertEqual(self.logger.dump_flight_recorder(), 2)
+        output = self.output.getvalue()
+        self.assertNotIn("Too verbose", output)
+        self.assertIn("Kept", output)
+        self.assertIn("Bound job=sync", output)
+        self.assertEqual(self.logger.dump_flight_recorder(), 0)
+
+
+    def fail_order(self, order_id):
+        raise ValueError(f"order {order_id} rejected")
+
+    def test_exception_traceback_rendered_once_per_window(self):
+        logger = Logger(output=None)
+        logger.enable_file_logging(log_dir=self.temp_dir, file_format="json")
+        for i in range(3):
+            try:
+                self.fail_order(i)
+            except ValueError:
+                logger.exception("placing order %s failed", i)
+        logger.close()
+
+        log_file = os.path.join(self.temp_dir, os.listdir(self.temp_dir)[0])
+        with open(log_file) as f:
+            records = [json.loads(line) for line in f]
+        self.assertEqual(len(records), 3)
+        first, second, third = records
+        fingerprint = first["data"]["fingerprint"]
+        self.assertEqual(first["level"], "ERROR")
+        self.assertIn("Traceback (most recent call last):", first["message"])
+        self.assertIn("in fail_order", first["message"])
+        self.assertTrue(first["message"].endswith("ValueError: order 0 rejected"))
+        self.assertEqual(first["data"]["exception"], "ValueError")
+        self.assertNotIn("Traceback", third["message"])
+        self.assertEqual(
+            third["message"],
+            f"placing order 2 failed [{fingerprint} seen 3 times in 60s, traceback suppressed] ValueError: order 2 rejected"
+        )
+        self.assertEqual((second["data"]["occurrences"], third["data"]["fingerprint"]), ("2", fingerprint))
+        self.assertEqual(logger.exception_tracker.suppressed, 2)
+
+    def test_exception_fingerprint_depends_on_raise_site(self):
+        fingerprints = []
+        for raise_twice in (False, True):
+            try:
+                if raise_twice:
+                    raise ValueError("elsewhere")
+                self.fail_order(1)
+            except ValueError as e:
+                fingerprints.append(self.logger.tracebacks.fingerprint(e))
+        self.assertNotEqual(fingerprints[0], fingerprints[1])
+
+    def test_exception_render_matches_traceback_module_and_is_cached(self):
+        import traceback
+        errors = []
+        for _ in range(2):
+            try:
+                try:
+                    self.fail_order(5)
+                except ValueError as e:
+                    raise RuntimeError("checkout failed") from e
+            except RuntimeError as e:
+                errors.append(e)
+        renderer = self.logger.tracebacks
+        for error in errors:
+            self.assertEqual(renderer.render(error), "".join(traceback.format_exception(type(error), error, error.__traceback__)))
+        self.assertEqual(renderer.rendered_stacks, 2)
+        self.assertEqual(renderer.fingerprint(errors[0]), renderer.fingerprint(errors[1]))
+
+    def test_exception_window_expiry_and_bound_context(self):
+        self.logger.enable_exception_dedup(window=0)
+        bound = self.logger.bind(request_id="r-1")
+        for _ in range(2):
+            try:
+                self.fail_order(3)
+            except ValueError:
+                bound.exception()
+        output = self.output.getvalue()
+        self.assertEqual(output.count("Traceback (most recent call last):"), 2)
+        self.assertIn("request_id=r-1", output)
+
+    def test_exception_without_active_exception_or_below_threshold(self):
+        self.logger.exception("nothing raised")
+        self.assertTrue(self.output.getvalue().rstrip().endswith("nothing raised"))
+        try:
+            self.fail_order(6)
+        except ValueError:
+            self.logger.exception("flag off", exc_info=False)
+            self.logger.exception("flag none", exc_info=None)
+        self.assertNotIn("Traceback", self.output.getvalue())
+        self.assertTrue(self.output.getvalue().rstrip().endswith("flag none"))
+        self.logger.min_level = LogLevel.FATAL
+        try:
+            self.fail_order(4)
+        except ValueError:
+            self.logger.exception("hidden")
+        self.assertNotIn("hidden", self.output.getvalue())
+        self.assertEqual(self.logger.exception_tracker.suppressed, 0)
+
+
 if __name__ == "__main__":
     unittest.main() 
\ No newline at end of file
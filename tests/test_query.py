@@ -0,0 +1,136 @@
+import unittest
+import io
+import os
+import gzip
+import json
+import shutil
+import tempfile
+from contextlib import redirect_stdout
+from src.logger import LogLevel
+from src.logger.query import LogIndex, main, parse_bound, query
+
+
+class TestLogQuery(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir)
+
+    def write_lines(self, name, lines, compress=False):
+        path = os.path.join(self.temp_dir, name)
+        text = "".join(f"{line}\n" for line in lines)
+        if compress:
+            with gzip.open(path, "wt", encoding="utf-8") as f:
+                f.write(text)
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(text)
+        return path
+
+    def day_lines(self, date, count, level="INFO"):
+        return [
+            f"{date} {index // 3600:02d}:{index // 60 % 60:02d}:{index % 60:02d} [{level:<8}] message {index}"
+            for index in range(count)
+        ]
+
+    def test_parse_bound(self):
+        self.assertEqual(parse_bound("2024-01-02"), "2024-01-02 00:00:00")
+        self.assertEqual(parse_bound("2024-01-02", is_end=True), "2024-01-02 23:59:59.999999")
+        self.assertEqual(parse_bound("2024-01-02T10:30", is_end=True), "2024-01-02 10:30:59.999999")
+        self.assertEqual(parse_bound("2024-01-02 10:30:15.25"), "2024-01-02 10:30:15.25")
+        with self.assertRaises(ValueError):
+            parse_bound("yesterday")
+
+    def test_time_range_uses_sparse_index(self):
+        path = self.write_lines("2024-01-02.log", self.day_lines("2024-01-02", 5000))
+        records = list(query(self.temp_dir, start="2024-01-02 01:00:00", end="2024-01-02 01:00:04", index_interval=4096))
+        self.assertEqual([record.message for record in records], [f"message {index}" for index in range(3600, 3605)])
+
+        index = LogIndex(path, interval=4096)
+        index.load()
+        self.assertEqual(index.indexed_size, os.path.getsize(path))
+        self.assertGreater(len(index.offsets), 10)
+        self.assertLess(len(index.offsets), 100)
+        with open(path, "rb") as f:
+            f.seek(index.seek_offset("2024-01-02 01:00:00"))
+            self.assertLessEqual(f.readline().decode()[:19], "2024-01-02 01:00:00")
+            self.assertGreater(f.tell(), os.path.getsize(path) // 2)
+
+    def test_out_of_order_records_near_the_bounds(self):
+        lines = self.day_lines("2024-01-02", 5000)
+        lines[3600], lines[3603] = lines[3603], lines[3600]
+        lines.insert(3604, "2024-01-02 00:59:58 [INFO    ] late writer")
+        path = self.write_lines("2024-01-02.log", lines)
+
+        records = list(query(self.temp_dir, start="2024-01-02 00:59:58", end="2024-01-02 01:00:00", index_interval=4096))
+        self.assertEqual([record.message for record in records], ["message 3598", "message 3599", "message 3600", "late writer"])
+        records = list(query(self.temp_dir, end="2024-01-02 00:00:01"))
+        self.assertEqual([record.message for record in records], ["message 0", "message 1"])
+
+        index = LogIndex(path, interval=4096)
+        index.load()
+        with open(path, "rb") as f:
+            f.seek(index.seek_offset("2024-01-02 01:00:00", slack=5))
+            self.assertLessEqual(f.readline().decode()[:19], "2024-01-02 00:59:55")
+
+    def test_index_grows_incrementally(self):
+        path = self.write_lines("2024-01-02.log", self.day_lines("2024-01-02", 1000))
+        list(query(self.temp_dir, index_interval=1024))
+        index = LogIndex(path)
+        index.load()
+        first_entries, first_size = list(index.offsets), index.indexed_size
+
+        with open(path, "a", encoding="utf-8") as f:
+            f.write("2024-01-02 05:00:00 [ERROR   ] appended later\n")
+        records = list(query(self.temp_dir, start="2024-01-02 05:00", index_interval=1024))
+        self.assertEqual([record.message for record in records], ["appended later"])
+
+        index.load()
+        self.assertEqual(index.offsets[:len(first_entries)], first_entries)
+        self.assertGreater(index.indexed_size, first_size)
+
+    def test_level_and_text_filters(self):
+        self.write_lines("2024-01-02.log", [
+            "2024-01-02 10:00:00 [INFO    ] connected",
+            "2024-01-02 10:00:01 [ERROR   ] request timeout",
+            "Traceback line",
+            "2024-01-02 10:00:02 [WARNING ] slow timeout",
+            "2024-01-02 10:00:03 [ERROR   ] disk full",
+        ])
+        records = list(query(self.temp_dir, min_level=LogLevel.ERROR, contains="timeout"))
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0].level, "ERROR")
+        self.assertEqual(records[0].message, "request timeout\nTraceback line")
+
+        records = list(query(self.temp_dir, min_level=LogLevel.WARNING, limit=2))
+        self.assertEqual([record.level for record in records], ["ERROR", "WARNING"])
+
+    def test_segments_compressed_and_json_files(self):
+        self.write_lines("2024-01-01.log", ["2024-01-01 23:59:59 [INFO    ] previous day"])
+        self.write_lines("2024-01-02.1.log.gz", ["2024-01-02 08:00:00 [INFO    ] first segment"], compress=True)
+        self.write_lines("2024-01-02.2.log", [json.dumps({"timestamp": "2024-01-02 09:00:00", "level": "INFO", "message": "second segment"}, separators=(",", ":"))])
+        self.write_lines("2024-01-02.log", ["2024-01-02 10:00:00 [INFO    ] current file"])
+        self.write_lines("2024-01-03.log", ["2024-01-03 00:00:00 [INFO    ] next day"])
+
+        records = list(query(self.temp_dir, start="2024-01-02", end="2024-01-02"))
+        self.assertEqual([record.message for record in records], ["first segment", "second segment", "current file"])
+
+    def test_cli_prints_matching_lines(self):
+        self.write_lines("2024-01-02.log", [
+            "2024-01-02 10:00:00 [INFO    ] connected",
+            "2024-01-02 10:00:01 [ERROR   ] request timeout",
+        ])
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--dir", self.temp_dir, "--since", "2024-01-02 10:00", "--level", "error"])
+        self.assertEqual(output.getvalue(), "2024-01-02 10:00:01 [ERROR   ] request timeout\n")
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            main(["--dir", self.temp_dir, "--grep", "connected", "--json"])
+        self.assertEqual(json.loads(output.getvalue())["message"], "connected")
+
+
+if __name__ == '__main__':
+    unittest.main()
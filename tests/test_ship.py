@@ -0,0 +1,170 @@
+import unittest
+import io
+import os
+import gzip
+import shutil
+import tempfile
+import time
+from src.logger import Logger, LogLevel
+from src.logger.ship import LogShipper, parse_line
+from stub_nexus import StubNexus
+
+
+class TestLogShipper(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubNexus()
+        self.temp_dir = tempfile.mkdtemp()
+        self.log_dir = os.path.join(self.temp_dir, "logs")
+
+    def tearDown(self):
+        self.stub.stop()
+        shutil.rmtree(self.temp_dir)
+
+    def logger(self, **file_options):
+        logger = Logger(output=io.StringIO(), min_level=LogLevel.DEBUG, service_name="svc")
+        logger.enable_file_logging(log_dir=self.log_dir, **file_options)
+        return logger
+
+    def shipper(self, **options):
+        options.setdefault("tail_settle", 0)
+        options.setdefault("retry_base_delay", 0)
+        return LogShipper(log_dir=self.log_dir, nexus_url=self.stub.url, service_name="svc", **options)
+
+    def messages(self):
+        return [record["message"] for record in self.stub.records()]
+
+    def test_ships_plain_records_with_multiline_messages(self):
+        logger = self.logger()
+        logger.info("order %s filled", 1)
+        try:
+            raise ValueError("bad price")
+        except ValueError:
+            logger.exception("pricing failed")
+        logger.debug("done")
+        logger.close()
+
+        self.assertEqual(self.shipper().ship_once(), 3)
+        records = self.stub.records()
+        self.assertEqual([record["level"] for record in records], ["INFO", "ERROR", "DEBUG"])
+        self.assertEqual({record["service"] for record in records}, {"svc"})
+        self.assertEqual(records[0]["message"], "order 1 filled")
+        self.assertIn("Traceback (most recent call last):", records[1]["message"])
+        self.assertTrue(records[1]["message"].endswith("ValueError: bad price"))
+        self.assertTrue(all(isinstance(body, list) for body in self.stub.requests))
+
+    def test_restart_resumes_from_checkpoint(self):
+        logger = self.logger()
+        for i in range(5):
+            logger.info(f"first {i}")
+        logger.flush()
+        self.assertEqual(self.shipper().ship_once(), 5)
+
+        for i in range(3):
+            logger.info(f"second {i}")
+        logger.close()
+        self.assertEqual(self.shipper().ship_once(), 3)
+        self.assertEqual(self.shipper().ship_once(), 0)
+        self.assertEqual(self.messages(), [f"first {i}" for i in range(5)] + [f"second {i}" for i in range(3)])
+
+    def test_active_tail_waits_until_settled(self):
+        logger = self.logger()
+        logger.info("one")
+        logger.info("two")
+        logger.flush()
+        shipper = self.shipper(tail_settle=60)
+        self.assertEqual(shipper.ship_once(), 1)
+        shipper.tail_settle = 0
+        self.assertEqual(shipper.ship_once(), 1)
+        logger.close()
+        self.assertEqual(self.messages(), ["one", "two"])
+
+    def test_follows_size_rotation_and_compression(self):
+        logger = self.logger(max_bytes=400, compress=True)
+        shipper = self.shipper(batch_size=7)
+        expected = []
+        for round_number in range(3):
+            for i in range(20):
+                message = f"round {round_number} record {i}"
+                logger.info(message)
+                expected.append(message)
+            logger.flush()
+            logger.file_handler.archiver._jobs.join()
+            shipper.ship_once()
+        logger.close()
+        shipper.ship_once()
+
+        names = os.listdir(self.log_dir)
+        self.assertTrue(any(name.endswith(".log.gz") for name in names))
+        self.assertEqual(self.messages(), expected)
+        self.assertEqual(len({record["id"] for record in self.stub.records()}), len(expected))
+
+    def test_resumes_inside_file_compressed_since_checkpoint(self):
+        logger = self.logger()
+        for i in range(4):
+            logger.info(f"record {i}")
+        logger.close()
+        self.assertEqual(self.shipper().ship_once(), 4)
+
+        logger = self.logger()
+        logger.info("record 4")
+        logger.close()
+        path = os.path.join(self.log_dir, os.listdir(self.log_dir)[0])
+        with open(path, "rb") as source, gzip.open(path + ".gz", "wb") as target:
+            target.write(source.read())
+        os.remove(path)
+
+        self.assertEqual(self.shipper().ship_once(), 1)
+        self.assertEqual(self.messages(), [f"record {i}" for i in range(5)])
+
+    def test_failed_post_is_retried_without_loss_or_duplicates(self):
+        logger = self.logger()
+        for i in range(10):
+            logger.info(f"record {i}")
+        logger.close()
+
+        shipper = self.shipper(batch_size=4)
+        self.stub.status = 500
+        self.assertEqual(shipper.ship_once(), 0)
+        self.assertEqual(shipper.stats()["failed_batches"], 1)
+        self.stub.status = 200
+        self.assertEqual(shipper.ship_once(), 10)
+        self.assertEqual(self.messages(), [f"record {i}" for i in range(10)])
+
+    def test_record_ids_are_stable_across_reshipping(self):
+        logger = self.logger()
+        logger.info("same record")
+        logger.close()
+        self.shipper().ship_once()
+        os.remove(os.path.join(self.log_dir, ".ship.checkpoint"))
+        self.shipper().ship_once()
+        ids = [record["id"] for record in self.stub.records()]
+        self.assertEqual(len(ids), 2)
+        self.assertEqual(ids[0], ids[1])
+
+    def test_structured_lines_keep_service_and_data(self):
+        logger = self.logger(file_format="json")
+        logger.warning("disk at %d%%", 93, data={"mount": "/"})
+        logger.close()
+        self.shipper().ship_once()
+        record = self.stub.records()[0]
+        self.assertEqual((record["level"], record["service"], record["message"]), ("WARNING", "svc", "disk at 93%"))
+        self.assertEqual(record["data"], {"mount": "/"})
+
+    def test_parse_line_keeps_fractional_timestamp(self):
+        record = parse_line("2024-05-01 13:00:00.250000 [INFO    ] hello", "svc")
+        self.assertEqual(record.message, "hello")
+        self.assertAlmostEqual(record.created % 1, 0.25)
+        self.assertIsNone(parse_line("not a log line", "svc"))
+
+    def test_throughput_cap(self):
+        logger = self.logger()
+        for i in range(60):
+            logger.info(f"record {i}")
+        logger.close()
+        started = time.monotonic()
+        self.assertEqual(self.shipper(batch_size=10, max_rate=200).ship_once(), 60)
+        self.assertGreaterEqual(time.monotonic() - started, 0.25)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,138 @@
+import unittest
+import os
+import time
+import shutil
+import tempfile
+from src.logger import APIHandler, LogLevel
+from src.logger.spool import CircuitBreaker, DiskSpool
+from stub_nexus import StubNexus
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_after_threshold_and_backs_off(self):
+        breaker = CircuitBreaker(failure_threshold=2, base_delay=0.05, max_delay=0.1)
+        breaker.record_failure()
+        self.assertTrue(breaker.allow())
+        breaker.record_failure()
+        self.assertFalse(breaker.allow())
+
+        time.sleep(0.06)
+        self.assertTrue(breaker.allow())
+        self.assertFalse(breaker.allow())
+        breaker.record_failure()
+        self.assertGreater(breaker.retry_in(), 0.05)
+
+        time.sleep(0.11)
+        self.assertTrue(breaker.allow())
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+
+class TestDiskSpool(unittest.TestCase):
+    def setUp(self):
+        self.spool_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.spool_dir)
+
+    def test_offsets_survive_restart(self):
+        spool = DiskSpool(self.spool_dir, segment_bytes=50)
+        spool.append([f'{{"n":{i}}}'.encode() for i in range(10)])
+        records, position = spool.read_batch(4, 1024)
+        self.assertEqual(records, [b'{"n":0}', b'{"n":1}', b'{"n":2}', b'{"n":3}'])
+        spool.commit(position)
+        spool.close()
+
+        reopened = DiskSpool(self.spool_dir, segment_bytes=50)
+        records, position = reopened.read_batch(100, 1024 * 1024)
+        self.assertEqual(records, [f'{{"n":{i}}}'.encode() for i in range(4, 10)])
+        reopened.commit(position)
+        self.assertFalse(reopened.pending())
+        self.assertEqual(len([name for name in os.listdir(self.spool_dir) if name.endswith(".jsonl")]), 1)
+
+    def test_torn_tail_is_repaired(self):
+        spool = DiskSpool(self.spool_dir)
+        spool.append([b'{"n":1}'])
+        spool.close()
+        with open(os.path.join(self.spool_dir, "spool-00000001.jsonl"), "ab") as f:
+            f.write(b'{"n":')
+
+        reopened = DiskSpool(self.spool_dir)
+        reopened.append([b'{"n":2}'])
+        records, _ = reopened.read_batch(100, 1024)
+        self.assertEqual(records, [b'{"n":1}', b'{"n":2}'])
+
+    def test_max_bytes_drops_oldest_segments(self):
+        spool = DiskSpool(self.spool_dir, segment_bytes=20, max_bytes=60)
+        for i in range(20):
+            spool.append([f'{{"n":{i:02d}}}'.encode()])
+
+        records, _ = spool.read_batch(100, 1024)
+        self.assertGreater(spool.dropped_records, 0)
+        self.assertEqual(len(records) + spool.dropped_records, 20)
+        self.assertEqual(records[-1], b'{"n":19}')
+
+
+class TestAPIHandlerSpooling(unittest.TestCase):
+    def setUp(self):
+        self.stub = StubNexus()
+        self.spool_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        self.stub.stop()
+        shutil.rmtree(self.spool_dir)
+
+    def test_outage_is_spooled_and_replayed(self):
+        self.stub.status = 503
+        handler = APIHandler(service_name="test", spool_dir=self.spool_dir, failure_threshold=2,
+                             retry_base_delay=0.05, retry_max_delay=0.2)
+        handler.nexus_url = self.stub.url
+
+        for i in range(20):
+            handler.send_log(LogLevel.INFO, f"m{i}")
+        handler.flush()
+
+        self.assertLessEqual(self.stub.attempts, 5)
+        counts = handler.delivery_counts()
+        self.assertEqual(counts["sent"], 0)
+        self.assertEqual(counts["failed"], 2)
+        self.assertEqual(counts["spooled"], 20)
+
+        self.stub.status = 200
+        deadline = time.monotonic() + 5
+        while handler.spool.pending() and time.monotonic() < deadline:
+            time.sleep(0.02)
+        handler.close()
+
+        replayed = [record["message"] for record in self.stub.records()]
+        self.assertEqual(replayed, [f"m{i}" for i in range(20)])
+        self.assertEqual(handler.delivery_counts()["replayed"], 20)
+        self.assertTrue(all(isinstance(body, list) for body in self.stub.requests))
+
+
+    def test_throttling_opens_breaker_and_spools(self):
+        self.stub.status = 429
+        handler = APIHandler(service_name="test", spool_dir=self.spool_dir, failure_threshold=2, retry_base_delay=60)
+        handler.nexus_url = self.stub.url
+        for i in range(5):
+            handler.send_log(LogLevel.INFO, f"m{i}")
+        handler.flush()
+        handler.close()
+
+        counts = handler.delivery_counts()
+        self.assertEqual((counts["sent"], counts["failed"], counts["spooled"]), (0, 2, 5))
+        self.assertEqual(handler.breaker.state, "open")
+
+    def test_client_error_is_rejected_not_sent(self):
+        self.stub.status = 400
+        handler = APIHandler(service_name="test", spool_dir=self.spool_dir)
+        handler.nexus_url = self.stub.url
+        handler.send_log(LogLevel.INFO, "malformed")
+        handler.close()
+
+        counts = handler.delivery_counts()
+        self.assertEqual((counts["sent"], counts["rejected"], counts["spooled"]), (0, 1, 0))
+        self.assertEqual(handler.breaker.state, "closed")
+
+if __name__ == "__main__":
+    unittest.main()